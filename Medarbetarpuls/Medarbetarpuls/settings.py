@@ -225,5 +225,48 @@ CELERY_BROKER_URL = "redis://localhost:6379/0"
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 
+# Periodic tasks, run with "celery -A Medarbetarpuls beat"
+CELERY_BEAT_SCHEDULE = {
+    "refresh-score-rollups": {
+        "task": "medarbetarapp.tasks.refresh_score_rollups",
+        "schedule": 15 * 60,  # seconds
+    },
+    "analyze-free-text": {
+        "task": "medarbetarapp.tasks.analyze_free_text",
+        "schedule": 15 * 60,  # seconds
+    },
+    "flush-answer-drafts": {
+        "task": "medarbetarapp.tasks.flush_answer_drafts",
+        "schedule": 10 * 60,  # seconds
+    },
+}
+
+# Cache for computed analysis results. Uses Redis when REDIS_CACHE_URL is set
+# (e.g. redis://localhost:6379/1), otherwise a per process memory cache.
+redis_cache_url = os.getenv("REDIS_CACHE_URL")
+if redis_cache_url:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": redis_cache_url,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Answers given question by question are kept as drafts in the cache until the
+# survey is submitted or left, which needs a cache shared by all processes.
+# Otherwise every answer is written to the database directly.
+ANSWER_DRAFTS_IN_CACHE = bool(redis_cache_url)
+
+# Only one process computes a cached analysis summary on a miss, while the others
+# serve the previous version, using a lock in the cache. This also needs a shared
+# cache, with the per process cache every process computes its own misses.
+SUMMARY_CACHE_LOCKS = bool(redis_cache_url)
+
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True  # Flush session when window is closed
 
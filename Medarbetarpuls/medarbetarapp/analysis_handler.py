@@ -1,8 +1,16 @@
 import math
+import hashlib
+import time
+from bisect import bisect_right
 import logging
-from django.db import models
-from django.db.models import QuerySet
-from typing import Any, Dict, List, Union, Optional
+from datetime import date
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from collections import Counter
+from django.db import models, transaction
+from django.db.models import QuerySet, Count, F, Q, Subquery
+from typing import Any, Callable, Dict, List, Union, Optional, Iterable
 from .models import (
     Survey,
     SurveyUserResult,
@@ -13,17 +21,69 @@ from .models import (
     QuestionFormat,
     QuestionType,
     Organization,
+    QuestionStats,
+    SurveyReport,
+    ScoreRollup,
+    TextAnalysis,
+    MAX_MULTIPLE_CHOICE_OPTIONS,
 )
-from statistics import median
+from . import stats_backend
 
 logger = logging.getLogger(__name__)
 
+# Percentiles reported for slider questions (boxplot whiskers, quartiles and median)
+SLIDER_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+# Cached survey summaries. The lock only has to outlive one summary computation.
+SUMMARY_CACHE_TIMEOUT = 60 * 60
+SUMMARY_LOCK_TIMEOUT = 30
+SUMMARY_LOCK_WAIT = 5
+
+# The bank question catalog of a group only changes when the surveys in range change
+BANK_QUESTIONS_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 class AnalysisHandler:
     """
     Handles logic for survey analysis.
+
+    A handler memoizes evaluated answer sets, comments, respondents and answer aggregates,
+    so repeated lookups with the same filters are free. Create one handler per request
+    (the memo is never invalidated), or call clear_memo() after answers have changed.
     """
 
+    def __init__(self):
+        self._memo: Dict[tuple, Any] = {}
+
+    def clear_memo(self):
+        """
+        Forget all memoized lookups.
+        """
+        self._memo.clear()
+
+    def _memoize(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        """
+        Return the memoized value for key, computing and storing it on the first lookup.
+        """
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    def _filter_key(
+        self,
+        survey: Survey | None = None,
+        user: CustomUser | None = None,
+        employee_group: EmployeeGroup | None = None,
+    ) -> tuple:
+        """
+        The part of a memo key that identifies the survey, user and employee group filters.
+        """
+        return (
+            survey.id if survey else None,
+            user.id if user else None,
+            employee_group.id if employee_group else None,
+        )
+
     def get_survey(self, survey_id: int) -> Survey:
         """
         Retrieve a specific survey by its ID.
@@ -84,6 +144,18 @@ class AnalysisHandler:
         Returns:
             QuerySet[Answer]: A queryset of Answer objects matching the provided filters, or an empty queryset if none found.
         """
+        key = ("answers", question.id, *self._filter_key(survey, user, employee_group))
+        return self._memoize(
+            key, lambda: self._fetch_answers(question, survey, user, employee_group)
+        )
+
+    def _fetch_answers(
+        self,
+        question: Question,
+        survey: Survey | None = None,
+        user: CustomUser | None = None,
+        employee_group: EmployeeGroup | None = None,
+    ) -> QuerySet[Answer]:
         filters = {"question": question, "survey__is_answered": True}
 
         if survey:
@@ -93,20 +165,58 @@ class AnalysisHandler:
             filters["survey__user"] = user
 
         elif employee_group:
-            filters["survey__user__in"] = employee_group.employees.all()
+            filters["survey__employee_groups"] = employee_group
 
         answers = Answer.objects.filter(**filters)
 
-        if not answers.exists():
+        # Evaluate the queryset once, so later iteration, len() and count() use the result cache
+        if not answers:
             if user:
                 logger.info(
                     "No answers available for %s", user or survey or employee_group
                 )
-                return Answer.objects.none()
+                return answers
             logger.info("No answers available.")
-            return Answer.objects.none()
         return answers
 
+    def get_user_answers(self, survey: Survey, user: CustomUser) -> Dict[int, Answer]:
+        """
+        Retrieve a user's own answers to a survey with one query, e.g. for showing
+        "Ditt svar" next to every question of the survey result.
+
+        Only answers of a submitted result are returned. Those never change, so a
+        non-empty result is also kept in Django's cache for the other questions of
+        the survey, which are loaded in separate requests.
+
+        Args:
+            survey (Survey): The survey the answers belong to.
+            user (CustomUser): The user who answered.
+
+        Returns:
+            Dict[int, Answer]: The user's answer per question id (with the question selected).
+        """
+
+        def fetch() -> Dict[int, Answer]:
+            key = f"user-answers:{survey.id}:{user.id}"
+            answers = cache.get(key)
+            if answers is None:
+                answers = {}
+                for answer in (
+                    Answer.objects.filter(
+                        survey__published_survey=survey,
+                        survey__user=user,
+                        survey__is_answered=True,
+                    )
+                    .select_related("question")
+                    .order_by("id")
+                ):
+                    answers.setdefault(answer.question_id, answer)
+                if answers:
+                    cache.set(key, answers, SUMMARY_CACHE_TIMEOUT)
+            return answers
+
+        return self._memoize(("user_answers", survey.id, user.id), fetch)
+
     def get_comments(
         self,
         question: Question,
@@ -126,6 +236,18 @@ class AnalysisHandler:
         Returns:
             QuerySet[Answer]: A queryset of Answer objects with non-empty comments matching the provided filters.
         """
+        key = ("comments", question.id, *self._filter_key(survey, user, employee_group))
+        return self._memoize(
+            key, lambda: self._fetch_comments(question, survey, user, employee_group)
+        )
+
+    def _fetch_comments(
+        self,
+        question: Question,
+        survey: Survey | None = None,
+        user: CustomUser | None = None,
+        employee_group: EmployeeGroup | None = None,
+    ) -> QuerySet[Answer]:
         filters = {
             "question": question,
             "survey__is_answered": True,
@@ -140,9 +262,12 @@ class AnalysisHandler:
             filters["survey__user"] = user
 
         elif employee_group:
-            filters["survey__user__in"] = employee_group.employees.all()
+            filters["survey__employee_groups"] = employee_group
 
-        return Answer.objects.filter(**filters).exclude(comment="")
+        comments = Answer.objects.filter(**filters).exclude(comment="")
+        # Evaluate the queryset once, so get_text_comments and count() use the result cache
+        len(comments)
+        return comments
 
     def get_text_comments(self, answers: QuerySet):
         """
@@ -159,12 +284,74 @@ class AnalysisHandler:
             text_comments.append(answer.comment)
         return text_comments
 
+    def get_text_themes(
+        self,
+        questions: Iterable[Question],
+        survey: Survey | None = None,
+        user: CustomUser | None = None,
+        employee_group: EmployeeGroup | None = None,
+        top: int = 10,
+    ) -> Dict[str, Any]:
+        """
+        Summarize the themes of the free text answers and comments of some questions, from the
+        precomputed TextAnalysis rows (see tasks.analyze_free_text). Texts that have not been
+        analyzed yet are not included.
+
+        Args:
+            questions (Iterable[Question]): The questions whose texts to summarize, e.g. all instances of a question.
+            survey (Survey, optional): Limit texts to those from this survey.
+            user (CustomUser, optional): Limit texts to those submitted by this user.
+            employee_group (EmployeeGroup, optional): Limit texts to those from members of this group.
+            top (int, optional): Number of keywords and bigrams to return.
+
+        Returns:
+            Dict[str, Any]: A dictionary with keys:
+                - 'keywords': List of (keyword, number of texts mentioning it), most common first.
+                - 'bigrams': List of (bigram, number of texts mentioning it), most common first.
+                - 'sentiment': Mean sentiment of the texts, between -1 and 1.
+                - 'text_count': Number of analyzed texts.
+        """
+        answers = self._filter_answers(
+            Answer.objects.filter(question__in=list(questions)),
+            survey,
+            user=user,
+            employee_group=employee_group,
+        )
+        analyses = TextAnalysis.objects.filter(answer__in=answers).values_list(
+            "keywords", "bigrams", "sentiment"
+        )
+
+        keyword_counts = Counter()
+        bigram_counts = Counter()
+        sentiment_sum = 0.0
+        text_count = 0
+        for keywords, bigrams, sentiment in analyses:
+            # Count every theme once per text, so one long comment does not dominate
+            keyword_counts.update(set(keywords))
+            bigram_counts.update(set(bigrams))
+            sentiment_sum += sentiment
+            text_count += 1
+
+        return {
+            "keywords": keyword_counts.most_common(top),
+            "bigrams": [
+                (bigram, count)
+                for bigram, count in bigram_counts.most_common(top)
+                if count > 1
+            ],
+            "sentiment": round(sentiment_sum / text_count, 2) if text_count else 0.0,
+            "text_count": text_count,
+        }
+
     def get_participation_metrics(
         self, surveys: List[Survey], employee_group: EmployeeGroup
     ) -> Dict[str, list]:
         """
         Calculate participation metrics across a list of surveys for a specific employee group.
 
+        The participants of a survey are the group members the survey was published to. Both counts
+        are computed for all surveys at once, with one query.
+
         Args:
             surveys (List[Survey]): A list of surveys to calculate metrics for.
             employee_group (EmployeeGroup): The group of employees whose participation is measured.
@@ -172,9 +359,9 @@ class AnalysisHandler:
         Returns:
             Dict[str, list]: A dictionary containing:
                 - 'survey_sending_dates' (List[str]): Formatted sending dates for each survey.
-                - 'participant_count_list' (List[int]): Total number of participants in the group per survey.
+                - 'participant_count_list' (List[int]): Number of group members the survey was published to.
                 - 'answered_count_list' (List[int]): Number of respondents who answered per survey.
-                - 'answer_pct_list' (List[float]): Percentage of respondents who answered, per survey.
+                - 'answer_pct_list' (List[float]): Percentage of respondents who answered, per survey (0 if there are no participants).
         """
         result = {
             "survey_sending_dates": [],
@@ -183,14 +370,28 @@ class AnalysisHandler:
             "answer_pct_list": [],
         }
 
+        group_results = Q(survey_results__employee_groups=employee_group)
+        counts = {
+            survey.id: survey
+            for survey in Survey.objects.filter(
+                id__in=[survey.id for survey in surveys]
+            ).annotate(
+                participant_count=Count("survey_results", filter=group_results),
+                answered_count=Count(
+                    "survey_results",
+                    filter=group_results & Q(survey_results__is_answered=True),
+                ),
+            )
+        }
+
         for survey in surveys:
-            total_participants = employee_group.employees.count()
-            answered_count = SurveyUserResult.objects.filter(
-                published_survey=survey,
-                user__in=employee_group.employees.all(),
-                is_answered=True,
-            ).count()
-            answer_pct = round((answered_count / total_participants) * 100, 1)
+            total_participants = counts[survey.id].participant_count
+            answered_count = counts[survey.id].answered_count
+            answer_pct = (
+                round((answered_count / total_participants) * 100, 1)
+                if total_participants > 0
+                else 0.0
+            )
             result["survey_sending_dates"].append(
                 survey.sending_date.strftime("%Y-%m-%d")
             )
@@ -214,10 +415,18 @@ class AnalysisHandler:
             Dict[str, CustomUser]: Anonymous labels mapping 'User 0', 'User 1', etc. to their corresponding responder,
 
         """
+        key = ("respondents", *self._filter_key(survey, None, employee_group))
+        return self._memoize(
+            key, lambda: self._fetch_respondents(survey, employee_group)
+        )
+
+    def _fetch_respondents(
+        self, survey: Survey, employee_group: EmployeeGroup | None = None
+    ) -> Dict[str, CustomUser]:
         filters = {"published_survey": survey}
 
         if employee_group:
-            filters["user__in"] = employee_group.employees.all()
+            filters["employee_groups"] = employee_group
 
         # Retrieve a list of user objects that responded to the given survey
         users = list(
@@ -230,49 +439,488 @@ class AnalysisHandler:
         anonymous_users = {f"User {i}": users[i] for i in range(len(users))}
         return anonymous_users
 
-    def get_bank_questions(self, surveys: list | None = None):
+    def get_bank_questions(
+        self,
+        surveys: Iterable[Survey] | None = None,
+        employee_group: EmployeeGroup | None = None,
+    ) -> List[Question]:
         """
         Retrieves all available bank questions or all bank questions that have been given across a list of surveys.
+        Yes/no questions are left out since they can't be analyzed over time. Free text
+        questions are included for the themes of their answers (see get_text_themes).
+
+        Every bank question is returned once, as its instance in the latest survey. The
+        catalog is one query; with an employee group it is also cached for that group and
+        set of surveys (the questions of a published survey never change).
 
         Args:
-            surveys (list | None): A list of Survey objects to filter questions from. If None, fetch from the full question bank.
+            surveys (Iterable[Survey] | None): Surveys to filter questions from. If None, fetch from the full question bank.
+            employee_group (EmployeeGroup | None): The group the surveys were sent to, used as cache key.
 
         Returns:
-            List[Question]: A list of unique, non-text bank questions.
+            List[Question]: A list of unique, analyzable bank questions.
+        """
+        analyzable = ~Q(question_format=QuestionFormat.YES_NO)
+        if surveys is None:
+            return list(
+                Question.objects.filter(analyzable, bank_question__isnull=False)
+                .distinct()
+                .order_by("id")
+            )
+
+        survey_ids = sorted({survey.id for survey in surveys})
+        if not survey_ids:
+            return []
+
+        def catalog() -> List[Question]:
+            instances = Question.objects.filter(
+                analyzable,
+                connected_surveys__in=survey_ids,
+                bank_question_tag__isnull=False,
+            )
+            # The latest instance (highest id) of every bank question
+            latest = (
+                instances.order_by()
+                .values("bank_question_tag")
+                .annotate(latest_id=models.Max("id"))
+                .values("latest_id")
+            )
+            return list(
+                Question.objects.filter(id__in=Subquery(latest)).order_by(
+                    "bank_question_tag"
+                )
+            )
+
+        if employee_group is None:
+            return catalog()
+
+        digest = hashlib.sha1(",".join(map(str, survey_ids)).encode()).hexdigest()
+        return cache.get_or_set(
+            f"bank-questions:{employee_group.id}:{digest}",
+            catalog,
+            BANK_QUESTIONS_CACHE_TIMEOUT,
+        )
+
+    # --------- BATCHED AGGREGATION -------------
+    def _filter_answers(
+        self,
+        answers: QuerySet[Answer],
+        survey: Survey | None = None,
+        user: CustomUser | None = None,
+        employee_group: EmployeeGroup | None = None,
+    ) -> QuerySet[Answer]:
+        """
+        Apply the standard answer filters (answered results, survey, user or employee group) to a queryset.
+        The returned queryset is lazy, so building it does not hit the database.
+        """
+        answers = answers.filter(survey__is_answered=True)
+
+        if survey:
+            answers = answers.filter(survey__published_survey=survey)
+        if user:
+            answers = answers.filter(survey__user=user)
+        elif employee_group:
+            answers = answers.filter(survey__employee_groups=employee_group)
+        return answers
+
+    def get_answer_aggregates(
+        self,
+        questions: Iterable[Question],
+        survey: Survey | None = None,
+        user: CustomUser | None = None,
+        employee_group: EmployeeGroup | None = None,
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Aggregate the answers of several questions at once, using one grouped query for the
+        answer values and one query for the free text answers and comments.
 
+        When the answers are not filtered to a single user the aggregates of closed surveys are
+        read from their SurveyReport, and the answer values of other surveys from the precomputed
+        QuestionStats instead of being grouped from the answers.
+
+        Args:
+            questions (Iterable[Question]): The questions to aggregate.
+            survey (Survey, optional): Limit answers to those from this survey.
+            user (CustomUser, optional): Limit answers to those submitted by this user.
+            employee_group (EmployeeGroup, optional): Limit answers to those from members of this group.
+
+        Returns:
+            Dict[int, Dict[str, Any]]: Maps each question id to a dictionary with keys:
+                - 'count': Number of answers.
+                - 'slider': Counter of slider value -> number of answers.
+                - 'yes_no': Counter of yes/no value -> number of answers.
+                - 'multiple_choice': List with the number of selections per option.
+                - 'free_text_answers': List of free text answers.
+                - 'text_comments': List of non-empty comments.
         """
-        bank_questions = []
-        if surveys:
-            all_survey_questions = []
-            for survey in surveys:
-                all_survey_questions += survey.questions.all()
+        questions = list(questions)
+        key = (
+            "aggregates",
+            frozenset(question.id for question in questions),
+            *self._filter_key(survey, user, employee_group),
+        )
+        return self._memoize(
+            key,
+            lambda: self._fetch_answer_aggregates(
+                questions, survey, user, employee_group
+            ),
+        )
 
-            # Filter bank questions that are used in the surveys
-            filtered_bank_questions = [
-                question
-                for question in all_survey_questions
-                if question.bank_question_tag is not None
+    def _fetch_answer_aggregates(
+        self,
+        questions: List[Question],
+        survey: Survey | None = None,
+        user: CustomUser | None = None,
+        employee_group: EmployeeGroup | None = None,
+        use_reports: bool = True,
+    ) -> Dict[int, Dict[str, Any]]:
+        if user is None and use_reports:
+            reported = self._get_reported_aggregates(questions, employee_group)
+            questions = [
+                question for question in questions if question.id not in reported
             ]
+        else:
+            reported = {}
+
+        aggregates = {
+            question.id: {
+                "count": 0,
+                "slider": Counter(),
+                "yes_no": Counter(),
+                "multiple_choice": [],
+                "free_text_answers": [],
+                "text_comments": [],
+            }
+            for question in questions
+        }
+        aggregates.update(reported)
+        if not questions:
+            return aggregates
+
+        answers = self._filter_answers(
+            Answer.objects.filter(question__in=questions),
+            survey,
+            user=user,
+            employee_group=employee_group,
+        )
 
-            # This part of the code makes sure we only get singular bank_question objects
-            seen_questions = []
-            for question in filtered_bank_questions:
-                if question.question not in seen_questions:
-                    bank_questions.append(question)
-                    seen_questions.append(question.question)
+        if user is None:
+            self._add_question_stats(aggregates, questions, employee_group)
         else:
-            bank_questions = Question.objects.filter(
-                bank_question__isnull=False,
+            self._add_grouped_answer_values(aggregates, answers)
+
+        # Text has to be fetched row by row, but only for text questions and actual comments
+        text_rows = (
+            answers.filter(
+                Q(question__question_format=QuestionFormat.TEXT)
+                | (Q(comment__isnull=False) & ~Q(comment=""))
+            )
+            .values_list(
+                "question_id",
+                "question__question_format",
+                "free_text_answer",
+                "comment",
+            )
+            .order_by("id")
+        )
+        for question_id, question_format, free_text_answer, comment in text_rows:
+            aggregate = aggregates[question_id]
+            if question_format == QuestionFormat.TEXT:
+                aggregate["free_text_answers"].append(free_text_answer)
+            if comment:
+                aggregate["text_comments"].append(comment)
+
+        return aggregates
+
+    def _get_reported_aggregates(
+        self,
+        questions: List[Question],
+        employee_group: EmployeeGroup | None = None,
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Read the aggregates of questions that belong to a closed survey from its SurveyReport.
+        Reports that are outdated (answers arrived after they were computed) are ignored.
+        """
+        if not questions:
+            return {}
+        group_key = str(employee_group.id) if employee_group else "all"
+        question_ids = {str(question.id) for question in questions}
+
+        reports = SurveyReport.objects.filter(
+            survey__questions__in=questions,
+            answer_count=F("survey__collected_answer_count"),
+        ).distinct()
+
+        aggregates = {}
+        for report in reports:
+            report_aggregates = report.aggregates.get(group_key, {})
+            for question_id in question_ids & set(report.aggregates.get("all", {})):
+                aggregates[int(question_id)] = self._deserialize_aggregate(
+                    report_aggregates.get(question_id)
+                )
+        return aggregates
+
+    def _serialize_aggregate(self, aggregate: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert an answer aggregate to JSON compatible values (see get_answer_aggregates).
+        """
+        return {
+            "count": aggregate["count"],
+            "slider": sorted(aggregate["slider"].items()),
+            "yes_no": [aggregate["yes_no"][True], aggregate["yes_no"][False]],
+            "multiple_choice": aggregate["multiple_choice"],
+            "free_text_answers": aggregate["free_text_answers"],
+            "text_comments": aggregate["text_comments"],
+        }
+
+    def _deserialize_aggregate(
+        self, serialized: Dict[str, Any] | None
+    ) -> Dict[str, Any]:
+        """
+        Convert an aggregate stored in a SurveyReport back to an answer aggregate. A missing
+        aggregate (e.g. a group without respondents) is an empty aggregate.
+        """
+        serialized = serialized or {}
+        yes_count, no_count = serialized.get("yes_no", [0, 0])
+        return {
+            "count": serialized.get("count", 0),
+            "slider": Counter(
+                {value: count for value, count in serialized.get("slider", [])}
+            ),
+            "yes_no": Counter({True: yes_count, False: no_count}),
+            "multiple_choice": list(serialized.get("multiple_choice", [])),
+            "free_text_answers": list(serialized.get("free_text_answers", [])),
+            "text_comments": list(serialized.get("text_comments", [])),
+        }
+
+    def build_survey_report(
+        self, survey: Survey, purge_drafts: bool = False
+    ) -> SurveyReport:
+        """
+        Compute the final aggregates of a closed survey, for all respondents and for every
+        employee group its respondents belonged to, and store them as a SurveyReport.
+
+        Args:
+            survey (Survey): The survey whose deadline has passed.
+            purge_drafts (bool, optional): Also delete the answers of results that were never submitted.
+
+        Returns:
+            SurveyReport: The created or updated report.
+        """
+        with transaction.atomic():
+            # Lock the survey, so no result can be submitted while the report is computed
+            survey = Survey.objects.select_for_update().get(id=survey.id)
+            questions = list(
+                Question.objects.filter(connected_surveys=survey).order_by("id")
+            )
+            groups = EmployeeGroup.objects.filter(
+                survey_results__published_survey=survey
             ).distinct()
 
-        # Remove free text questions since it's not possible to analyze them
-        for idx, question in enumerate(bank_questions):
-            if (
-                question.question_format == QuestionFormat.TEXT
-                or question.question_format == QuestionFormat.YES_NO
-            ):
-                bank_questions.pop(idx)
-        return bank_questions
+            report_aggregates = {}
+            for group_key, employee_group in [("all", None)] + [
+                (str(group.id), group) for group in groups
+            ]:
+                aggregates = self._fetch_answer_aggregates(
+                    questions, survey, employee_group=employee_group, use_reports=False
+                )
+                report_aggregates[group_key] = {
+                    str(question_id): self._serialize_aggregate(aggregate)
+                    for question_id, aggregate in aggregates.items()
+                }
+
+            report, _ = SurveyReport.objects.update_or_create(
+                survey=survey,
+                defaults={
+                    "answer_count": survey.collected_answer_count,
+                    "aggregates": report_aggregates,
+                },
+            )
+
+            if purge_drafts:
+                Answer.objects.filter(
+                    survey__published_survey=survey, survey__is_answered=False
+                ).delete()
+
+        return report
+
+    def _add_question_stats(
+        self,
+        aggregates: Dict[int, Dict[str, Any]],
+        questions: List[Question],
+        employee_group: EmployeeGroup | None = None,
+    ):
+        """
+        Fill in the answer values of the aggregates from the precomputed QuestionStats.
+        """
+        stats = QuestionStats.objects.filter(
+            question__in=questions, employee_group=employee_group
+        )
+        for stat in stats:
+            aggregate = aggregates[stat.question_id]
+            aggregate["count"] = stat.answer_count
+            aggregate["slider"].update(stat.histogram)
+            aggregate["yes_no"].update({True: stat.yes_count, False: stat.no_count})
+            aggregate["multiple_choice"] = list(stat.multiple_choice_counts)
+
+    def _add_grouped_answer_values(
+        self, aggregates: Dict[int, Dict[str, Any]], answers: QuerySet[Answer]
+    ):
+        """
+        Fill in the answer values of the aggregates with one query grouped on every answer value
+        column at once. Slider answers live on a small domain and multiple choice answers (as
+        bitmasks) on a small set of combinations, so the result stays compact.
+        """
+        value_rows = (
+            answers.values(
+                "question_id",
+                "slider_answer",
+                "yes_no_answer",
+                "multiple_choice_mask",
+            )
+            .annotate(answer_count=Count("id"))
+            .order_by()
+        )
+        for row in value_rows:
+            aggregate = aggregates[row["question_id"]]
+            answer_count = row["answer_count"]
+            aggregate["count"] += answer_count
+            if row["slider_answer"] is not None:
+                aggregate["slider"][row["slider_answer"]] += answer_count
+            if row["yes_no_answer"] is not None:
+                aggregate["yes_no"][row["yes_no_answer"]] += answer_count
+            if row["multiple_choice_mask"]:
+                counts = aggregate["multiple_choice"]
+                mask = row["multiple_choice_mask"]
+                counts.extend([0] * (mask.bit_length() - len(counts)))
+                for idx in range(mask.bit_length()):
+                    if mask >> idx & 1:
+                        counts[idx] += answer_count
+
+    def _get_question_aggregate(
+        self,
+        question: Question,
+        survey: Survey | None = None,
+        user: CustomUser | None = None,
+        employee_group: EmployeeGroup | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Aggregate the answers of a single question, see get_answer_aggregates.
+        """
+        return self.get_answer_aggregates(
+            [question], survey, user=user, employee_group=employee_group
+        )[question.id]
+
+    def _get_lazy_answer_sets(
+        self,
+        question: Question,
+        survey: Survey | None = None,
+        user: CustomUser | None = None,
+        employee_group: EmployeeGroup | None = None,
+    ) -> tuple[QuerySet[Answer], QuerySet[Answer]]:
+        """
+        Build the (unevaluated) answer and comment querysets that are part of every question summary.
+        """
+        answers = self._filter_answers(
+            Answer.objects.filter(question=question),
+            survey,
+            user=user,
+            employee_group=employee_group,
+        )
+        comments = answers.filter(comment__isnull=False).exclude(comment="")
+        return answers, comments
+
+    def get_answer_column(self, answers, field: str) -> list:
+        """
+        Fetch one answer column as a plain list, skipping missing values.
+
+        Querysets are read with a single values_list query instead of loading model instances,
+        so the column can be handed straight to the statistics backend.
+
+        Args:
+            answers (QuerySet[Answer] | Iterable[Answer]): The answers to read the column from.
+            field (str): Name of the answer field, e.g. 'slider_answer'.
+
+        Returns:
+            list: The non-missing values of the field.
+        """
+        if isinstance(answers, QuerySet):
+            return list(
+                answers.filter(**{f"{field}__isnull": False}).values_list(
+                    field, flat=True
+                )
+            )
+        return [getattr(a, field) for a in answers if getattr(a, field) is not None]
+
+    def summarize_slider_histogram(self, histogram: Dict[float, int]) -> Dict[str, Any]:
+        """
+        Compute the slider statistics from a histogram of slider values.
+
+        Args:
+            histogram (Dict[float, int]): Maps each slider value to the number of answers with that value.
+
+        Returns:
+            Dict[str, Any]: A dictionary with keys:
+                - 'mean': Mean slider value (unrounded).
+                - 'standard_deviation': Standard deviation, rounded to two decimals.
+                - 'variation_coefficient': Coefficient of variation, rounded to two decimals.
+                - 'median': Median slider value, rounded to two decimals.
+                - 'quantiles': Slider value per percentile in SLIDER_QUANTILES, rounded to two decimals.
+                - 'distribution': Counts per slider value 1 through 10 (values are rounded to the closest integer).
+                - 'enps': Tuple of (promoters, passives, detractors).
+        """
+        n = sum(histogram.values())
+        distribution = [0] * 10
+        promoters = passives = detractors = 0
+        for value, count in histogram.items():
+            bucket = math.floor(value + 0.5)
+            if 1 <= bucket <= 10:
+                distribution[bucket - 1] += count
+            if value >= 9:
+                promoters += count
+            elif value >= 7:
+                passives += count
+            else:
+                detractors += count
+
+        if n == 0:
+            return {
+                "mean": 0.0,
+                "standard_deviation": 0.0,
+                "variation_coefficient": 0.0,
+                "median": 0.0,
+                "quantiles": self.calculate_quantiles(histogram),
+                "distribution": distribution,
+                "enps": (promoters, passives, detractors),
+            }
+
+        mean = sum(value * count for value, count in histogram.items()) / n
+        variance = (
+            sum(count * (value - mean) ** 2 for value, count in histogram.items()) / n
+        )
+        standard_deviation = math.sqrt(variance)
+        variation_coefficient = (standard_deviation / mean) * 100 if mean != 0 else 0.0
+
+        quantiles = self.calculate_quantiles(histogram)
+
+        return {
+            "mean": mean,
+            "standard_deviation": round(standard_deviation, 2),
+            "variation_coefficient": round(variation_coefficient, 2),
+            "median": quantiles[0.5],
+            "quantiles": quantiles,
+            "distribution": distribution,
+            "enps": (promoters, passives, detractors),
+        }
+
+    def get_multiple_choice_distribution(
+        self, option_counts: list[int], answer_options: list
+    ) -> list[int]:
+        """
+        Match aggregated selection counts to the answer options of a multiple choice question.
+        """
+        dist = list(option_counts[: len(answer_options)])
+        return dist + [0] * (len(answer_options) - len(dist))
 
     # --------- SLIDER-QUESTION FUNCTIONALITY -------------
     def calculate_enps_data(self, answers) -> tuple[int, int, int]:
@@ -288,10 +936,8 @@ class AnalysisHandler:
             passives (int): Number of answers with 7 <= slider_answer < 9.
             detractors (int): Number of answers with slider_answer < 7.
         """
-        promoters = answers.filter(slider_answer__gte=9).count()
-        passives = answers.filter(slider_answer__gte=7, slider_answer__lt=9).count()
-        detractors = answers.filter(slider_answer__lt=7).count()
-        return promoters, passives, detractors
+        values = self.get_answer_column(answers, "slider_answer")
+        return stats_backend.slider_statistics(values)["enps"]
 
     def calculate_enps_score(
         self, promoters: int, passives: int, detractors: int
@@ -324,12 +970,8 @@ class AnalysisHandler:
         Returns:
             list[int]: A list of 10 integers where the element at index i-1 is the count of responses with `slider_answer == i` for i from 1 to 10.
         """
-        return [
-            answers.filter(
-                slider_answer__gte=i - 0.5, slider_answer__lt=i + 0.5
-            ).count()
-            for i in range(1, 11)
-        ]
+        values = self.get_answer_column(answers, "slider_answer")
+        return stats_backend.slider_statistics(values)["distribution"]
 
     def get_enps_summary(
         self,
@@ -337,6 +979,7 @@ class AnalysisHandler:
         question: Question,
         user: CustomUser | None = None,
         employee_group: EmployeeGroup | None = None,
+        aggregate: Dict[str, Any] | None = None,
     ) -> Dict[str, Any]:
         """
         Generate a summary of eNPS analysis.
@@ -346,6 +989,7 @@ class AnalysisHandler:
             question (Question): The ENPS-type question to analyze.
             user (CustomUser, optional): Filter responses to a specific user.
             employee_group (EmployeeGroup, optional): Filter responses to a specific group.
+            aggregate (Dict[str, Any], optional): Precomputed answer aggregate (see get_answer_aggregates).
 
         Returns:
             Dict[str, Any]: A dictionary with keys:
@@ -362,79 +1006,144 @@ class AnalysisHandler:
                 - 'standard_deviation': Standard deviation of answers.
                 - 'variation_coefficient': Coefficient of variation.
         """
-
-        answers = self.get_answers(
+        if aggregate is None:
+            aggregate = self._get_question_aggregate(
+                question, survey, user=user, employee_group=employee_group
+            )
+        answers, comments = self._get_lazy_answer_sets(
             question, survey, user=user, employee_group=employee_group
         )
 
-        promoters, passives, detractors = self.calculate_enps_data(answers)
+        statistics = self.summarize_slider_histogram(aggregate["slider"])
+        promoters, passives, detractors = statistics["enps"]
         score = self.calculate_enps_score(promoters, passives, detractors)
-        distribution = self.get_response_distribution_slider(answers)
-        standard_deviation = self.calculate_standard_deviation(answers)
-        variation_coefficient = self.calculate_variation_coefficient(answers)
-        comments = self.get_comments(
-            question, survey, user=user, employee_group=employee_group
-        )
-        mean = round(self.calculate_mean(answers), 2)
         return {
             "question": question,
             "question_format": question.question_type,
             "answers": answers,
             "enpsScore": score,
             "comments": comments,
-            "text_comments": self.get_text_comments(comments),
+            "text_comments": aggregate["text_comments"],
             "enpsPieLabels": ["Detractors", "Passives", "Promoters"],
             "enpsPieData": [detractors, passives, promoters],
             "slider_values": [str(i) for i in range(1, 11)],
-            "enpsDistribution": distribution,
-            "standard_deviation": standard_deviation,
-            "variation_coefficient": variation_coefficient,
-            "mean": mean,
+            "enpsDistribution": statistics["distribution"],
+            "standard_deviation": statistics["standard_deviation"],
+            "variation_coefficient": statistics["variation_coefficient"],
+            "mean": round(statistics["mean"], 2),
         }
 
     def calculate_mean(self, answers) -> float:
         """
         Calculate the average slider answer from a set of responses.
         """
-        values = [a.slider_answer for a in answers if a.slider_answer is not None]
-        n = len(values)
-        if n == 0:
-            return 0.0
-        mean = sum(values) / n
-        return mean
+        values = self.get_answer_column(answers, "slider_answer")
+        return stats_backend.slider_statistics(values)["mean"]
 
     def calculate_standard_deviation(self, answers) -> float:
         """Calculate standard deviation for slider answers."""
-        values = [a.slider_answer for a in answers if a.slider_answer is not None]
-        n = len(values)
-        if n == 0:
-            return 0.0
-        mean = self.calculate_mean(answers)
-        variance = sum((x - mean) ** 2 for x in values) / n
-        standard_deviation = math.sqrt(variance)
-        return round(standard_deviation, 2)
+        values = self.get_answer_column(answers, "slider_answer")
+        return stats_backend.slider_statistics(values)["standard_deviation"]
 
     def calculate_variation_coefficient(self, answers) -> float:
         """Calculate coefficient of variation for slider answers."""
+        values = self.get_answer_column(answers, "slider_answer")
+        return stats_backend.slider_statistics(values)["variation_coefficient"]
 
-        values = [a.slider_answer for a in answers if a.slider_answer is not None]
-        n = len(values)
-        if n == 0:
-            return 0.0
-        mean = self.calculate_mean(answers)
-        if mean == 0:
-            return 0.0
-        variance = sum((x - mean) ** 2 for x in values) / n
-        std_dev = math.sqrt(variance)
-        cv = (std_dev / mean) * 100
-        return round(cv, 2)
+    def get_slider_histogram(self, answers: QuerySet[Answer]) -> Dict[float, int]:
+        """
+        Count the slider answers per slider value with one grouped query.
+
+        Args:
+            answers (QuerySet[Answer]): A queryset of Answer objects with a `slider_answer` field.
+
+        Returns:
+            Dict[float, int]: Maps each answered slider value to the number of answers with that value.
+        """
+        rows = (
+            answers.filter(slider_answer__isnull=False)
+            .values_list("slider_answer")
+            .annotate(answer_count=Count("id"))
+            .order_by()
+        )
+        return {value: count for value, count in rows}
+
+    def calculate_quantiles(
+        self,
+        histogram: Dict[float, int],
+        quantiles: Iterable[float] = SLIDER_QUANTILES,
+    ) -> Dict[float, float]:
+        """
+        Compute exact quantiles of the slider answers from a histogram of slider values.
+
+        Uses linear interpolation between the two closest ranks, so the 0.5 quantile is the
+        usual median (the mean of the two middle values for an even number of answers).
+
+        Args:
+            histogram (Dict[float, int]): Maps each slider value to the number of answers with that value.
+            quantiles (Iterable[float], optional): Quantiles to compute, between 0 and 1.
+
+        Returns:
+            Dict[float, float]: Maps each quantile to its slider value, rounded to two decimals.
+            All quantiles are 0.0 if there are no answers.
+        """
+        values = sorted(value for value, count in histogram.items() if count > 0)
+        cumulative_counts = []
+        n = 0
+        for value in values:
+            n += histogram[value]
+            cumulative_counts.append(n)
+
+        def value_at_rank(rank: int) -> float:
+            # The value whose answers cover the given (zero-based) rank in the sorted answers
+            return values[bisect_right(cumulative_counts, rank)]
+
+        result = {}
+        for quantile in quantiles:
+            if n == 0:
+                result[quantile] = 0.0
+                continue
+            position = quantile * (n - 1)
+            lower_rank = math.floor(position)
+            lower = value_at_rank(lower_rank)
+            upper = value_at_rank(min(lower_rank + 1, n - 1))
+            result[quantile] = round(
+                lower + (upper - lower) * (position - lower_rank), 2
+            )
+        return result
+
+    def get_slider_quantiles(
+        self,
+        question: Question,
+        survey: Survey | None = None,
+        user: CustomUser | None = None,
+        employee_group: EmployeeGroup | None = None,
+        quantiles: Iterable[float] = SLIDER_QUANTILES,
+    ) -> Dict[float, float]:
+        """
+        Compute quantiles (e.g. quartiles or p10/p90) for a slider question without loading the answers.
+
+        Args:
+            question (Question): The slider-format question to analyze.
+            survey (Survey, optional): The survey containing the question.
+            user (CustomUser, optional): Filter answers to a specific user.
+            employee_group (EmployeeGroup, optional): Filter answers to a specific group.
+            quantiles (Iterable[float], optional): Quantiles to compute, between 0 and 1.
+
+        Returns:
+            Dict[float, float]: Maps each quantile to its slider value, rounded to two decimals.
+        """
+        answers = self._filter_answers(
+            Answer.objects.filter(question=question),
+            survey,
+            user=user,
+            employee_group=employee_group,
+        )
+        return self.calculate_quantiles(self.get_slider_histogram(answers), quantiles)
 
     def calculate_median(self, answers) -> float:
         """Calculate median for slider answers."""
-        values = [a.slider_answer for a in answers if a.slider_answer is not None]
-        if not values:
-            return 0.0
-        return round(median(values), 2)
+        return self.calculate_quantiles(self.get_slider_histogram(answers), (0.5,))[0.5]
 
     def get_slider_summary(
         self,
@@ -442,6 +1151,7 @@ class AnalysisHandler:
         survey: Survey,
         user: CustomUser | None = None,
         employee_group: EmployeeGroup | None = None,
+        aggregate: Dict[str, Any] | None = None,
     ) -> Dict[str, Any]:
         """
             Generates a summary for slider analysis.
@@ -454,6 +1164,7 @@ class AnalysisHandler:
             survey (Survey): The survey containing the question.
             user (CustomUser, optional): Filter answers to a specific user.
             employee_group (EmployeeGroup, optional): Filter answers to a specific group.
+            aggregate (Dict[str, Any], optional): Precomputed answer aggregate (see get_answer_aggregates).
 
         Returns:
             Dict[str, Any]: A dictionary with keys:
@@ -468,34 +1179,37 @@ class AnalysisHandler:
                 - 'slider_cv': Coefficient of variation.
                 - 'slider_mean': Mean slider score.
                 - 'slider_median': Median slider score.
+                - 'slider_quartiles': Tuple of the lower quartile, median and upper quartile.
+                - 'slider_quantiles': Slider score per percentile in SLIDER_QUANTILES.
 
         """
-
-        answers = self.get_answers(
+        if aggregate is None:
+            aggregate = self._get_question_aggregate(
+                question, survey, user=user, employee_group=employee_group
+            )
+        answers, comments = self._get_lazy_answer_sets(
             question, survey, user=user, employee_group=employee_group
         )
 
-        distribution = self.get_response_distribution_slider(answers)
-        standard_deviation = self.calculate_standard_deviation(answers)
-        variation_coefficient = self.calculate_variation_coefficient(answers)
-        median = self.calculate_median(answers)
-
-        comments = self.get_comments(
-            question, survey, user=user, employee_group=employee_group
-        )
-        mean = round(self.calculate_mean(answers), 2)
+        statistics = self.summarize_slider_histogram(aggregate["slider"])
         return {
             "question": question,
             "question_format": question.question_format,
             "answers": answers,
             "slider_values": [str(i) for i in range(1, 11)],
             "comments": comments,
-            "text_comments": self.get_text_comments(comments),
-            "slider_distribution": distribution,
-            "slider_std": standard_deviation,
-            "slider_cv": variation_coefficient,
-            "slider_mean": mean,
-            "slider_median": median,
+            "text_comments": aggregate["text_comments"],
+            "slider_distribution": statistics["distribution"],
+            "slider_std": statistics["standard_deviation"],
+            "slider_cv": statistics["variation_coefficient"],
+            "slider_mean": round(statistics["mean"], 2),
+            "slider_median": statistics["median"],
+            "slider_quartiles": (
+                statistics["quantiles"][0.25],
+                statistics["quantiles"][0.5],
+                statistics["quantiles"][0.75],
+            ),
+            "slider_quantiles": statistics["quantiles"],
         }
 
     # ---------------- MULTIPLE CHOICE ------------
@@ -510,16 +1224,25 @@ class AnalysisHandler:
             List[int]: Distribution over the answers, where each index corresponds to the number of times that option was selected.
 
         """
-        dist = [0] * len(answer_options)
+        if isinstance(answers, QuerySet):
+            # Count the selections of every option in the database, from the answer bitmasks
+            option_masks = {
+                f"option_{idx}": F("multiple_choice_mask").bitand(1 << idx)
+                for idx in range(min(len(answer_options), MAX_MULTIPLE_CHOICE_OPTIONS))
+            }
+            counts = answers.alias(**option_masks).aggregate(
+                **{
+                    f"{name}_count": Count("id", filter=Q(**{f"{name}__gt": 0}))
+                    for name in option_masks
+                }
+            )
+            return [
+                counts.get(f"option_{idx}_count", 0)
+                for idx in range(len(answer_options))
+            ]
 
-        for a in answers:
-            selected_options = a.multiple_choice_answer
-            if selected_options:
-                # Loop over the available options and check if the option is selected. If it's selected (set to True) add +1 to the corresponding index of that answer option.
-                for idx, selected in enumerate(selected_options):
-                    if selected and idx < len(dist):
-                        dist[idx] += 1
-        return dist
+        selections = self.get_answer_column(answers, "multiple_choice_answer")
+        return stats_backend.multiple_choice_counts(selections, len(answer_options))
 
     def get_multiple_choice_summary(
         self,
@@ -527,6 +1250,7 @@ class AnalysisHandler:
         survey: Survey,
         user: CustomUser | None = None,
         employee_group: EmployeeGroup | None = None,
+        aggregate: Dict[str, Any] | None = None,
     ) -> Dict[str, Any]:
         """
         Generate a summary for a multiple choice question.
@@ -539,6 +1263,7 @@ class AnalysisHandler:
             survey (Survey): The survey the question belongs to.
             user (CustomUser, optional): Limit responses to a specific user.
             employee_group (EmployeeGroup, optional): Limit responses to users in this group.
+            aggregate (Dict[str, Any], optional): Precomputed answer aggregate (see get_answer_aggregates).
 
         Returns:
             Dict[str, Any]: A dictionary with keys:
@@ -563,18 +1288,23 @@ class AnalysisHandler:
             }
 
         answer_options = question.specific_question.options
-        answers = self.get_answers(
+        if aggregate is None:
+            aggregate = self._get_question_aggregate(
+                question, survey, user=user, employee_group=employee_group
+            )
+        answers, comments = self._get_lazy_answer_sets(
             question, survey, user=user, employee_group=employee_group
         )
 
-        distribution = self.get_response_distribution_mc(answers, answer_options)
-        comments = self.get_comments(question, survey)
+        distribution = self.get_multiple_choice_distribution(
+            aggregate["multiple_choice"], answer_options
+        )
         return {
             "question": question,
             "question_format": question.question_format,
             "answers": answers,
             "comments": comments,
-            "text_comments": self.get_text_comments(comments),
+            "text_comments": aggregate["text_comments"],
             "multiple_choice_labels": answer_options,
             "multiple_choice_distribution": distribution,
         }
@@ -583,9 +1313,8 @@ class AnalysisHandler:
     def get_response_distribution_yes_no(self, answers) -> list[int]:
         """Retrieves the distribution for how many respondents picked each answer."""
 
-        yes_count = sum(1 for a in answers if a.yes_no_answer is True)
-        no_count = sum(1 for a in answers if a.yes_no_answer is False)
-        return [yes_count, no_count]
+        values = self.get_answer_column(answers, "yes_no_answer")
+        return stats_backend.yes_no_counts(values)
 
     def get_yes_no_summary(
         self,
@@ -593,6 +1322,7 @@ class AnalysisHandler:
         survey: Survey,
         user: CustomUser | None = None,
         employee_group: EmployeeGroup | None = None,
+        aggregate: Dict[str, Any] | None = None,
     ) -> Dict[str, Any]:
         """
         Generate a summary for a yes_no question.
@@ -605,6 +1335,7 @@ class AnalysisHandler:
             survey (Survey): The survey containing the question.
             user (CustomUser, optional): Filter responses by a specific user.
             employee_group (EmployeeGroup, optional): Filter responses by a group.
+            aggregate (Dict[str, Any], optional): Precomputed answer aggregate (see get_answer_aggregates).
 
         Returns:
             Dict[str, Any]: A dictionary with keys:
@@ -622,26 +1353,29 @@ class AnalysisHandler:
             "YES",
             "NO",
         ]
-        answers = self.get_answers(
+        if aggregate is None:
+            aggregate = self._get_question_aggregate(
+                question, survey, user=user, employee_group=employee_group
+            )
+        answers, comments = self._get_lazy_answer_sets(
             question, survey, user=user, employee_group=employee_group
         )
-        distribution = self.get_response_distribution_yes_no(answers)
-        answer_count = answers.count()
+        distribution = [aggregate["yes_no"][True], aggregate["yes_no"][False]]
+        answer_count = aggregate["count"]
 
         yes_percentage = (
-            round((distribution[0] / answer_count) * 100, 1) if answers else 0
+            round((distribution[0] / answer_count) * 100, 1) if answer_count else 0
         )
         no_percentage = (
-            round((distribution[1] / answer_count) * 100, 1) if answers else 0
+            round((distribution[1] / answer_count) * 100, 1) if answer_count else 0
         )
 
-        comments = self.get_comments(question, survey)
         return {
             "question": question,
             "question_format": question.question_format,
             "comments": comments,
             "answers": answers,
-            "text_comments": self.get_text_comments(comments),
+            "text_comments": aggregate["text_comments"],
             "yes_no_labels": answer_options,
             "yes_no_distribution": distribution,
             "yes_percentage": yes_percentage,
@@ -655,6 +1389,7 @@ class AnalysisHandler:
         survey: Survey,
         user: CustomUser | None = None,
         employee_group: EmployeeGroup | None = None,
+        aggregate: Dict[str, Any] | None = None,
     ) -> Dict[str, Any]:
         """
         Generate a summary for a free text question
@@ -667,6 +1402,7 @@ class AnalysisHandler:
             survey (Survey): The survey containing the question.
             user (CustomUser, optional): Filter responses by a specific user.
             employee_group (EmployeeGroup, optional): Filter responses by a group.
+            aggregate (Dict[str, Any], optional): Precomputed answer aggregate (see get_answer_aggregates).
 
         Returns:
             Dict[str, Any]: A dictionary with keys:
@@ -680,25 +1416,22 @@ class AnalysisHandler:
 
 
         """
-        answers = self.get_answers(
+        if aggregate is None:
+            aggregate = self._get_question_aggregate(
+                question, survey, user=user, employee_group=employee_group
+            )
+        answers, comments = self._get_lazy_answer_sets(
             question, survey, user=user, employee_group=employee_group
         )
 
-        text_answers = []
-        for answer in answers:
-            text_answers.append(answer.free_text_answer)
-
-        comments = self.get_comments(question, survey)
-        answer_count = answers.count() if answers else 0
-
         return {
             "question": question,
             "question_format": question.question_format,
             "answers": answers,
-            "free_text_answers": text_answers,
-            "answer_count": answer_count,
+            "free_text_answers": aggregate["free_text_answers"],
+            "answer_count": aggregate["count"],
             "comments": comments,
-            "text_comments": self.get_text_comments(comments),
+            "text_comments": aggregate["text_comments"],
         }
 
     # --------------- FULL SURVEY SUMMARY -----------
@@ -711,6 +1444,8 @@ class AnalysisHandler:
     ) -> Dict[str, Any]:
         """
         This function returns a summary for a whole survey. Optionally filtered to a specific user or an employee_group.
+        All answers of the survey are aggregated up front (see get_answer_aggregates), so the number of
+        queries does not grow with the number of questions.
 
         Args:
             survey_id (int): The ID of the survey to summarize.
@@ -733,52 +1468,268 @@ class AnalysisHandler:
             "summaries": [],
         }
         # Fetch all questions from the given survey_id
-        questions = Question.objects.filter(connected_surveys__id=survey_id)
+        questions = list(
+            Question.objects.filter(connected_surveys__id=survey_id)
+            .select_related("multiple_choice_question")
+            .order_by("id")
+        )
+        aggregates = self.get_answer_aggregates(
+            questions, survey, user=user, employee_group=employee_group
+        )
 
         for question in questions:
-            if question.question_format == QuestionFormat.MULTIPLE_CHOICE:
-                question_summary = self.get_multiple_choice_summary(
-                    question=question,
-                    survey=survey,
-                    user=user,
-                    employee_group=employee_group,
-                )
-            elif question.question_format == QuestionFormat.YES_NO:
-                question_summary = self.get_yes_no_summary(
-                    question=question,
-                    survey=survey,
-                    user=user,
-                    employee_group=employee_group,
-                )
-            elif question.question_format == QuestionFormat.TEXT:
-                question_summary = self.get_free_text_summary(
-                    question=question,
-                    survey=survey,
-                    user=user,
-                    employee_group=employee_group,
-                )
-            elif question.question_type == QuestionType.ENPS:
-                question_summary = self.get_enps_summary(
-                    survey=survey,
-                    question=question,
-                    user=user,
-                    employee_group=employee_group,
-                )
-            elif question.question_format == QuestionFormat.SLIDER:
-                question_summary = self.get_slider_summary(
-                    question=question,
-                    survey=survey,
-                    user=user,
-                    employee_group=employee_group,
-                )
-            else:
+            question_summary = self.get_question_summary(
+                question,
+                survey,
+                user=user,
+                employee_group=employee_group,
+                aggregate=aggregates[question.id],
+            )
+            if question_summary is None:
                 continue  # skip unknown formats
 
             summary["summaries"].append(question_summary)
 
         return summary
 
+    def get_cached_question_summary(
+        self,
+        question: Question,
+        survey: Survey,
+        user: CustomUser | None = None,
+        employee_group: EmployeeGroup | None = None,
+    ) -> Dict[str, Any] | None:
+        """
+        Return the summary of one question (see get_question_summary) from Django's cache
+        when possible. Entries are versioned by the survey's collected_answer_count, so
+        submitting a new result invalidates them. Used when the questions of a survey
+        result are loaded one at a time.
+
+        Args:
+            question (Question): The question to summarize.
+            survey (Survey): The survey containing the question.
+            user (CustomUser, optional): Filter responses to a specific user.
+            employee_group (EmployeeGroup, optional): Filter responses to users in this group.
+
+        Returns:
+            Dict[str, Any] | None: The question summary, or None if the question format is unknown.
+        """
+
+        def compute():
+            aggregates = self.get_answer_aggregates(
+                [question], survey, user=user, employee_group=employee_group
+            )
+            return self.get_question_summary(
+                question,
+                survey,
+                user=user,
+                employee_group=employee_group,
+                aggregate=aggregates[question.id],
+            )
+
+        def strip(question_summary):
+            if question_summary is None:
+                return None
+            return self._strip_question_summary(question_summary)
+
+        def restore(question_summary):
+            if question_summary is not None:
+                answers, comments = self._get_lazy_answer_sets(
+                    question, survey, user=user, employee_group=employee_group
+                )
+                question_summary["answers"] = answers
+                question_summary["comments"] = comments
+            return question_summary
+
+        return self._get_versioned_cached(
+            "question-summary:{}:{}:{}:{}".format(
+                question.id, *self._filter_key(survey, user, employee_group)
+            ),
+            survey,
+            compute=compute,
+            strip=strip,
+            restore=restore,
+        )
+
+    def _get_versioned_cached(
+        self,
+        key_prefix: str,
+        survey: Survey,
+        compute: Callable[[], Any],
+        strip: Callable[[Any], Any],
+        restore: Callable[[Any], Any],
+    ) -> Any:
+        """
+        Read a value from Django's cache, versioned by the survey's collected_answer_count.
+        With a cache shared by all processes (settings.SUMMARY_CACHE_LOCKS), only one request
+        computes the value on a miss (under a lock in the cache). The others serve the previous
+        version if there is one, or wait for the computation to finish. A per process cache can
+        not coordinate the processes, so there every miss is computed.
+
+        Args:
+            key_prefix (str): Cache key without the version.
+            survey (Survey): The survey whose answers the value is computed from.
+            compute (Callable[[], Any]): Computes the value.
+            strip (Callable[[Any], Any]): Makes a computed value ready for pickling.
+            restore (Callable[[Any], Any]): Turns a value read from the cache back into a computed value.
+
+        Returns:
+            Any: The (restored) value.
+        """
+        # Read the version from the database, the survey instance may be outdated
+        version = (
+            Survey.objects.filter(id=survey.id)
+            .values_list("collected_answer_count", flat=True)
+            .first()
+        )
+        key = f"{key_prefix}:v{version}"
+
+        # None can be a computed value, so misses are told apart by a sentinel
+        missing = object()
+        cached = cache.get(key, missing)
+        if cached is not missing:
+            return restore(cached)
+
+        if not settings.SUMMARY_CACHE_LOCKS:
+            value = compute()
+            cache.set(key, strip(value), SUMMARY_CACHE_TIMEOUT)
+            return value
+
+        if cache.add(f"{key}:lock", True, SUMMARY_LOCK_TIMEOUT):
+            try:
+                value = compute()
+                cached = strip(value)
+                cache.set_many(
+                    {key: cached, f"{key_prefix}:latest": cached},
+                    SUMMARY_CACHE_TIMEOUT,
+                )
+            finally:
+                cache.delete(f"{key}:lock")
+            return value
+
+        # Another request is computing this version, serve the previous one meanwhile
+        stale = cache.get(f"{key_prefix}:latest", missing)
+        if stale is not missing:
+            return restore(stale)
+
+        deadline = time.monotonic() + SUMMARY_LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(0.1)
+            cached = cache.get(key, missing)
+            if cached is not missing:
+                return restore(cached)
+
+        logger.warning("Timed out waiting for cached value %s", key)
+        return compute()
+
+    def _strip_question_summary(
+        self, question_summary: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Copy a question summary without the answer and comment querysets, which would be
+        evaluated (and stored with every answer) if they were pickled into the cache.
+        """
+        return {
+            key: value
+            for key, value in question_summary.items()
+            if key not in ("answers", "comments")
+        }
+
+    def get_question_summary(
+        self,
+        question: Question,
+        survey: Survey,
+        user: CustomUser | None = None,
+        employee_group: EmployeeGroup | None = None,
+        aggregate: Dict[str, Any] | None = None,
+    ) -> Dict[str, Any] | None:
+        """
+        Generate the format specific summary for a question.
+
+        Args:
+            question (Question): The question to summarize.
+            survey (Survey): The survey containing the question.
+            user (CustomUser, optional): Filter responses to a specific user.
+            employee_group (EmployeeGroup, optional): Filter responses to users in this group.
+            aggregate (Dict[str, Any], optional): Precomputed answer aggregate (see get_answer_aggregates).
+
+        Returns:
+            Dict[str, Any] | None: The question summary, or None if the question format is unknown.
+        """
+        if question.question_format == QuestionFormat.MULTIPLE_CHOICE:
+            return self.get_multiple_choice_summary(
+                question=question,
+                survey=survey,
+                user=user,
+                employee_group=employee_group,
+                aggregate=aggregate,
+            )
+        elif question.question_format == QuestionFormat.YES_NO:
+            return self.get_yes_no_summary(
+                question=question,
+                survey=survey,
+                user=user,
+                employee_group=employee_group,
+                aggregate=aggregate,
+            )
+        elif question.question_format == QuestionFormat.TEXT:
+            return self.get_free_text_summary(
+                question=question,
+                survey=survey,
+                user=user,
+                employee_group=employee_group,
+                aggregate=aggregate,
+            )
+        elif question.question_type == QuestionType.ENPS:
+            return self.get_enps_summary(
+                survey=survey,
+                question=question,
+                user=user,
+                employee_group=employee_group,
+                aggregate=aggregate,
+            )
+        elif question.question_format == QuestionFormat.SLIDER:
+            return self.get_slider_summary(
+                question=question,
+                survey=survey,
+                user=user,
+                employee_group=employee_group,
+                aggregate=aggregate,
+            )
+        return None
+
     # ----------------------- HISTORY ----------------------
+    def get_question_lineage(
+        self, question: Question, surveys: Iterable[Survey]
+    ) -> Dict[int, Question]:
+        """
+        Find the instances of a question in several surveys with one indexed query.
+
+        All copies of a template or bank question share its lineage key, so the
+        question is found in every survey even if the wording was edited in between.
+
+        Args:
+            question (Question): Any instance of the question (or the original question).
+            surveys (Iterable[Survey]): The surveys to look in.
+
+        Returns:
+            Dict[int, Question]: Maps survey id to that survey's instance of the question.
+        """
+        lineage_key = question.lineage_key
+        instances = (
+            Question.objects.filter(
+                Q(lineage_id=lineage_key) | Q(id=lineage_key),
+                connected_surveys__in=surveys,
+            )
+            .annotate(lineage_survey_id=F("connected_surveys__id"))
+            .select_related("multiple_choice_question")
+            .order_by("id")
+        )
+        survey_questions = {}
+        for instance in instances:
+            survey_questions.setdefault(instance.lineage_survey_id, instance)
+        return survey_questions
+
     def get_question_trend(
         self,
         question: Question,
@@ -790,6 +1741,7 @@ class AnalysisHandler:
         Generate a trend summary for a specific question across multiple surveys.
 
         For each survey where the question is present, this method collects summary statistics (depending on the question format) and organizes them chronologically by survey sending date (Ex. the surveys go from [latest, ..., oldest]).
+        The answers of all surveys are aggregated together, so the number of queries does not grow with the number of surveys.
 
          Args:
             question (Question): The question to track over time.
@@ -808,51 +1760,28 @@ class AnalysisHandler:
             "sending_dates_trend": [],
         }
 
-        for survey in sorted(surveys, key=lambda s: s.sending_date, reverse=True):
-            _question = question
+        # Each survey has its own question objects, so look up this question's instance in every survey
+        survey_questions = self.get_question_lineage(question, surveys)
+
+        # The instances belong to one survey each, so aggregating them together (grouped per
+        # question) gives the answers of every survey in a constant number of queries
+        aggregates = self.get_answer_aggregates(
+            survey_questions.values(), user=user, employee_group=employee_group
+        )
 
-            # Fetch the question object corresponding to the same string as the input question. This is needed because each survey has unique question objects.
-            question_obj = survey.questions.filter(question=_question.question).first()
+        for survey in sorted(surveys, key=lambda s: s.sending_date, reverse=True):
+            question_obj = survey_questions.get(survey.id)
             if question_obj is None:
                 continue
 
-            if question_obj.question_format == QuestionFormat.MULTIPLE_CHOICE:
-                question_summary = self.get_multiple_choice_summary(
-                    question=question_obj,
-                    survey=survey,
-                    user=user,
-                    employee_group=employee_group,
-                )
-
-            elif question_obj.question_format == QuestionFormat.YES_NO:
-                question_summary = self.get_yes_no_summary(
-                    question=question_obj,
-                    survey=survey,
-                    user=user,
-                    employee_group=employee_group,
-                )
-            elif question_obj.question_format == QuestionFormat.TEXT:
-                question_summary = self.get_free_text_summary(
-                    question=question_obj,
-                    survey=survey,
-                    user=user,
-                    employee_group=employee_group,
-                )
-            elif question_obj.question_type == QuestionType.ENPS:
-                question_summary = self.get_enps_summary(
-                    question=question_obj,
-                    survey=survey,
-                    user=user,
-                    employee_group=employee_group,
-                )
-            elif question_obj.question_format == QuestionFormat.SLIDER:
-                question_summary = self.get_slider_summary(
-                    question=question_obj,
-                    survey=survey,
-                    user=user,
-                    employee_group=employee_group,
-                )
-            else:
+            question_summary = self.get_question_summary(
+                question=question_obj,
+                survey=survey,
+                user=user,
+                employee_group=employee_group,
+                aggregate=aggregates[question_obj.id],
+            )
+            if question_summary is None:
                 continue
 
             trend_summary["survey_ids_trend"].append(survey.id)
@@ -868,6 +1797,68 @@ class AnalysisHandler:
 
         return trend_summary
 
+    def get_organization_rollup(
+        self,
+        organization: Organization,
+        question: Question,
+        months: int = 24,
+    ) -> Dict[str, Any]:
+        """
+        Monthly slider and eNPS statistics of a question for a whole organization and each of its
+        employee groups, read from the ScoreRollup table (see tasks.refresh_score_rollups).
+
+        Args:
+            organization (Organization): The organization to analyze.
+            question (Question): Any instance of the question, all surveys with the same question lineage are included.
+            months (int, optional): Number of months back in time to include (including the current month).
+
+        Returns:
+            Dict[str, Any]: A dictionary with keys:
+                - 'months': List of months ('YYYY-MM') that have answers, in chronological order.
+                - 'series': Maps the organization name and every group name to a dictionary with the lists
+                  'answer_count', 'mean', 'standard_deviation' and 'enps_score', one value per month
+                  (None for months without answers from that group).
+        """
+        today = timezone.localdate()
+        month_index = today.year * 12 + today.month - 1 - (months - 1)
+        since = date(month_index // 12, month_index % 12 + 1, 1)
+
+        rollups = (
+            ScoreRollup.objects.filter(
+                organization=organization,
+                lineage_id=question.lineage_key,
+                month__gte=since,
+            )
+            .select_related("employee_group")
+            .order_by("month")
+        )
+
+        month_labels = []
+        series_rollups: Dict[str, Dict[str, ScoreRollup]] = {}
+        for rollup in rollups:
+            month = rollup.month.strftime("%Y-%m")
+            if month not in month_labels:
+                month_labels.append(month)
+            label = (
+                rollup.employee_group.name
+                if rollup.employee_group
+                else organization.name
+            )
+            series_rollups.setdefault(label, {})[month] = rollup
+
+        series = {}
+        for label, rollup_by_month in series_rollups.items():
+            monthly = [rollup_by_month.get(month) for month in month_labels]
+            series[label] = {
+                "answer_count": [r.answer_count if r else None for r in monthly],
+                "mean": [round(r.mean, 2) if r else None for r in monthly],
+                "standard_deviation": [
+                    round(r.standard_deviation, 2) if r else None for r in monthly
+                ],
+                "enps_score": [r.enps_score if r else None for r in monthly],
+            }
+        return {"months": month_labels, "series": series}
+
     def get_survey_answer_distribution(
         self,
         survey: Survey,
@@ -878,7 +1869,8 @@ class AnalysisHandler:
         Compute how many participants answered each question in a survey.
 
         Optionally filters the answers by user or employee group. Returns the answer count
-        per question, as well as the total number of survey participants.
+        per question, as well as the total number of survey participants. Everything is
+        computed with one annotated query over the survey's questions.
 
         Args:
             survey (Survey): The survey whose questions will be analyzed.
@@ -887,7 +1879,7 @@ class AnalysisHandler:
 
         Returns:
             dict[str, Any]: A dictionary with:
-                - 'questions': List of Question objects in order.
+                - 'questions': List of Question objects, ordered by id (like 'answerDistributionLabels').
                 - 'answered_counts': Number of answers received per question.
                 - 'total_participants': Total participant count for each question.
         """
@@ -896,18 +1888,33 @@ class AnalysisHandler:
             "answered_counts": [],
             "total_participants": [],
         }
-        total_participants = survey.survey_results.count()
+        answer_filter = Q(
+            answers__survey__is_answered=True,
+            answers__survey__published_survey=survey,
+        )
+        if user:
+            answer_filter &= Q(answers__survey__user=user)
+        elif employee_group:
+            answer_filter &= Q(answers__survey__employee_groups=employee_group)
 
-        for q in survey.questions.all().order_by("id"):
-            answers_qs = self.get_answers(
-                question=q,
-                survey=survey,
-                user=user,
-                employee_group=employee_group,
+        participant_count = (
+            SurveyUserResult.objects.filter(published_survey=survey)
+            .values("published_survey")
+            .annotate(participant_count=Count("id"))
+            .values("participant_count")
+        )
+        questions = (
+            survey.questions.all()
+            .annotate(
+                answered_count=Count("answers", filter=answer_filter),
+                participant_count=Subquery(participant_count),
             )
+            .order_by("id")
+        )
 
+        for q in questions:
             result["questions"].append(q)
-            result["answered_counts"].append(answers_qs.count())
-            result["total_participants"].append(total_participants)
+            result["answered_counts"].append(q.answered_count)
+            result["total_participants"].append(q.participant_count or 0)
 
         return result
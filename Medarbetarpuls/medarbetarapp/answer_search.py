@@ -0,0 +1,152 @@
+"""
+Full text search over free text answers and comments.
+
+On SQLite the answers are indexed in the FTS5 table medarbetarapp_answer_search
+(see migration 0040_answer_search_index), which is kept in sync by triggers.
+Results are ranked with bm25 and paged with a keyset cursor of (rank, answer id),
+so later pages cost the same as the first one. Other databases fall back to a
+case insensitive LIKE in answer id order.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+from django.db.models import Q, QuerySet
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Answer, EmployeeGroup
+from .text_analysis import tokenize
+
+SEARCH_PAGE_SIZE = 20
+
+# Markers around matched words in snippets, replaced by <mark> after escaping
+_MATCH_START = "\x02"
+_MATCH_END = "\x03"
+
+_SEARCH_SQL = f"""
+    SELECT rowid, score, snippet FROM (
+        SELECT
+            rowid,
+            bm25(medarbetarapp_answer_search) AS score,
+            snippet(medarbetarapp_answer_search, -1, '{_MATCH_START}', '{_MATCH_END}', '…', 16) AS snippet
+        FROM medarbetarapp_answer_search
+        WHERE medarbetarapp_answer_search MATCH %s AND rowid IN ({{scope}})
+    )
+    WHERE score > %s OR (score = %s AND rowid > %s)
+    ORDER BY score, rowid
+    LIMIT %s
+"""
+
+
+def build_match_query(query: str) -> str:
+    """
+    Turn user input into an FTS5 query where every word has to match, as a
+    prefix ("arbets" finds "arbetsbelastning"). The words are quoted so FTS5
+    syntax in the input is searched for as text.
+
+    Returns:
+        str: The FTS5 query, empty if the input has no words.
+    """
+    return " ".join(f'"{token}"*' for token in tokenize(query))
+
+
+def parse_cursor(cursor: str | None) -> Tuple[float, int]:
+    """
+    Parse a cursor from search_answers, an invalid or missing cursor starts from the beginning.
+    """
+    try:
+        score, answer_id = (cursor or "").split(":")
+        return float(score), int(answer_id)
+    except ValueError:
+        return float("-inf"), 0
+
+
+def search_answers(
+    query: str,
+    employee_groups: QuerySet[EmployeeGroup],
+    after: str | None = None,
+    limit: int = SEARCH_PAGE_SIZE,
+) -> Dict[str, Any]:
+    """
+    Search the free text answers and comments of submitted survey results.
+
+    Args:
+        query (str): The words to search for.
+        employee_groups (QuerySet[EmployeeGroup]): Only results of these groups are searched,
+            by the group membership saved when the survey was published.
+        after (str, optional): The 'next_cursor' of the previous page.
+        limit (int, optional): The number of results per page. Defaults to SEARCH_PAGE_SIZE.
+
+    Returns:
+        Dict[str, Any]: A dictionary with keys:
+            - 'results': List of dictionaries with 'answer' (with question and survey selected),
+              'score' (lower is more relevant) and 'snippet' (html with the matches marked).
+            - 'next_cursor': Cursor of the next page, None on the last page.
+    """
+    match = build_match_query(query)
+    if not match:
+        return {"results": [], "next_cursor": None}
+
+    scope = Answer.objects.filter(
+        survey__is_answered=True, survey__employee_groups__in=employee_groups
+    ).values("id")
+    after_score, after_id = parse_cursor(after)
+
+    if connection.vendor == "sqlite":
+        rows = _search_fts(match, scope, after_score, after_id, limit + 1)
+    else:
+        rows = _search_like(query, scope, after_id, limit + 1)
+
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+    answers = Answer.objects.select_related(
+        "question", "survey__published_survey"
+    ).in_bulk([answer_id for answer_id, _, _ in rows])
+
+    results = [
+        {
+            "answer": answers[answer_id],
+            "score": score,
+            "snippet": mark_safe(
+                escape(snippet)
+                .replace(_MATCH_START, "<mark>")
+                .replace(_MATCH_END, "</mark>")
+            ),
+        }
+        for answer_id, score, snippet in rows
+        if answer_id in answers
+    ]
+    next_cursor = f"{rows[-1][1]!r}:{rows[-1][0]}" if has_next else None
+    return {"results": results, "next_cursor": next_cursor}
+
+
+def _search_fts(
+    match: str, scope: QuerySet, after_score: float, after_id: int, limit: int
+) -> List[Tuple[int, float, str]]:
+    try:
+        scope_sql, scope_params = scope.query.sql_with_params()
+    except EmptyResultSet:  # e.g. a user without survey groups
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _SEARCH_SQL.format(scope=scope_sql),
+            [match, *scope_params, after_score, after_score, after_id, limit],
+        )
+        return cursor.fetchall()
+
+
+def _search_like(
+    query: str, scope: QuerySet, after_id: int, limit: int
+) -> List[Tuple[int, float, str]]:
+    answers = Answer.objects.filter(id__in=scope, id__gt=after_id)
+    for token in tokenize(query):
+        answers = answers.filter(
+            Q(free_text_answer__icontains=token) | Q(comment__icontains=token)
+        )
+    rows = answers.order_by("id").values_list("id", "free_text_answer", "comment")
+    return [
+        (answer_id, 0.0, " / ".join(filter(None, (free_text, comment))))
+        for answer_id, free_text, comment in rows[:limit]
+    ]
@@ -0,0 +1,123 @@
+# Generated by Django 5.1.7 on 2026-10-17 03:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_question_stats(apps, schema_editor):
+    """
+    Builds the statistics for all results that were submitted before
+    the QuestionStats table existed.
+    """
+    SurveyUserResult = apps.get_model("medarbetarapp", "SurveyUserResult")
+    Answer = apps.get_model("medarbetarapp", "Answer")
+    QuestionStats = apps.get_model("medarbetarapp", "QuestionStats")
+
+    stats = {}
+    results = SurveyUserResult.objects.filter(is_answered=True).prefetch_related(
+        "user__employee_groups"
+    )
+    for result in results.iterator(chunk_size=500):
+        group_ids = [None]
+        if result.user is not None:
+            group_ids += [group.id for group in result.user.employee_groups.all()]
+
+        for answer in Answer.objects.filter(survey=result):
+            for group_id in group_ids:
+                key = (answer.question_id, group_id)
+                if key not in stats:
+                    stats[key] = QuestionStats(
+                        question_id=answer.question_id,
+                        employee_group_id=group_id,
+                        slider_histogram={},
+                        multiple_choice_counts=[],
+                    )
+                stat = stats[key]
+                stat.answer_count += 1
+                if answer.slider_answer is not None:
+                    value = float(answer.slider_answer)
+                    stat.slider_count += 1
+                    stat.slider_sum += value
+                    stat.slider_sum_squares += value * value
+                    hist_key = str(value)
+                    stat.slider_histogram[hist_key] = (
+                        stat.slider_histogram.get(hist_key, 0) + 1
+                    )
+                if answer.yes_no_answer is True:
+                    stat.yes_count += 1
+                elif answer.yes_no_answer is False:
+                    stat.no_count += 1
+                if answer.multiple_choice_answer:
+                    counts = stat.multiple_choice_counts
+                    selected_options = answer.multiple_choice_answer
+                    counts.extend([0] * (len(selected_options) - len(counts)))
+                    for idx, selected in enumerate(selected_options):
+                        if selected:
+                            counts[idx] += 1
+
+    QuestionStats.objects.bulk_create(stats.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("medarbetarapp", "0032_question_bank_question_tag"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QuestionStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("answer_count", models.IntegerField(default=0)),
+                ("slider_count", models.IntegerField(default=0)),
+                ("slider_sum", models.FloatField(default=0)),
+                ("slider_sum_squares", models.FloatField(default=0)),
+                ("slider_histogram", models.JSONField(default=dict)),
+                ("multiple_choice_counts", models.JSONField(default=list)),
+                ("yes_count", models.IntegerField(default=0)),
+                ("no_count", models.IntegerField(default=0)),
+                (
+                    "employee_group",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="medarbetarapp.employeegroup",
+                    ),
+                ),
+                (
+                    "question",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stats",
+                        to="medarbetarapp.question",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("employee_group__isnull", False)),
+                        fields=("question", "employee_group"),
+                        name="unique_group_question_stats",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("employee_group__isnull", True)),
+                        fields=("question",),
+                        name="unique_question_stats",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_question_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:05
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def backfill_question_lineage(apps, schema_editor):
+    """
+    Computes the content hash of all questions and links existing survey
+    questions to a lineage. Questions cloned from the question bank use the
+    bank question (bank_question_tag), other survey questions are grouped by
+    survey creator and content, which matches how trends were found before.
+    """
+    Question = apps.get_model("medarbetarapp", "Question")
+
+    questions = list(
+        Question.objects.prefetch_related("connected_surveys").order_by("id")
+    )
+    lineage_roots = {}
+    for question in questions:
+        normalized_text = " ".join((question.question or "").split()).casefold()
+        question.content_hash = hashlib.sha1(
+            f"{question.question_format}:{normalized_text}".encode()
+        ).hexdigest()
+
+        surveys = list(question.connected_surveys.all())
+        if question.bank_question_tag is not None:
+            question.lineage_id = question.bank_question_tag
+        elif surveys:
+            key = (surveys[0].creator_id, question.content_hash)
+            question.lineage_id = lineage_roots.setdefault(key, question.id)
+
+    Question.objects.bulk_update(
+        questions, ["content_hash", "lineage_id"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("medarbetarapp", "0033_questionstats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="content_hash",
+            field=models.CharField(blank=True, db_index=True, max_length=40),
+        ),
+        migrations.AddField(
+            model_name="question",
+            name="lineage_id",
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(backfill_question_lineage, migrations.RunPython.noop),
+    ]
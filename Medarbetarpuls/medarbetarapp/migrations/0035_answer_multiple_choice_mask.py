@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:10
+
+from django.db import migrations, models
+
+
+def backfill_multiple_choice_mask(apps, schema_editor):
+    """
+    Packs the multiple choice answers that were saved before the bitmask
+    column existed (bit i is set if option i is selected).
+    """
+    Answer = apps.get_model("medarbetarapp", "Answer")
+
+    answers = []
+    for answer in Answer.objects.exclude(multiple_choice_answer=[]).exclude(
+        multiple_choice_answer__isnull=True
+    ):
+        mask = 0
+        for idx, selected in enumerate(answer.multiple_choice_answer[:63]):
+            if selected:
+                mask |= 1 << idx
+        answer.multiple_choice_mask = mask
+        answers.append(answer)
+
+    Answer.objects.bulk_update(answers, ["multiple_choice_mask"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("medarbetarapp", "0034_question_lineage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="answer",
+            name="multiple_choice_mask",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_multiple_choice_mask, migrations.RunPython.noop),
+    ]
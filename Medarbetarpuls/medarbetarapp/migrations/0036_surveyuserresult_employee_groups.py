@@ -0,0 +1,43 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:16
+
+from django.db import migrations, models
+
+
+def backfill_result_groups(apps, schema_editor):
+    """
+    Results published before the snapshot existed get the groups their
+    user belongs to now, which is the best information available.
+    """
+    SurveyUserResult = apps.get_model("medarbetarapp", "SurveyUserResult")
+    ResultGroup = SurveyUserResult.employee_groups.through
+
+    result_groups = []
+    results = SurveyUserResult.objects.filter(user__isnull=False).prefetch_related(
+        "user__employee_groups"
+    )
+    for result in results.iterator(chunk_size=500):
+        for group in result.user.employee_groups.all():
+            result_groups.append(
+                ResultGroup(surveyuserresult_id=result.id, employeegroup_id=group.id)
+            )
+    ResultGroup.objects.bulk_create(result_groups, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("medarbetarapp", "0035_answer_multiple_choice_mask"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="surveyuserresult",
+            name="employee_groups",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="survey_results",
+                to="medarbetarapp.employeegroup",
+            ),
+        ),
+        migrations.RunPython(backfill_result_groups, migrations.RunPython.noop),
+    ]
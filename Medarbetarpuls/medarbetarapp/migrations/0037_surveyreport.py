@@ -0,0 +1,39 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("medarbetarapp", "0036_surveyuserresult_employee_groups"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SurveyReport",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now=True)),
+                ("answer_count", models.IntegerField(default=0)),
+                ("aggregates", models.JSONField(default=dict)),
+                (
+                    "survey",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="report",
+                        to="medarbetarapp.survey",
+                    ),
+                ),
+            ],
+        ),
+    ]
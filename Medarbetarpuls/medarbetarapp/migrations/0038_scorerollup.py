@@ -0,0 +1,85 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("medarbetarapp", "0037_surveyreport"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="surveyuserresult",
+            name="rolled_up",
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.CreateModel(
+            name="ScoreRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("lineage_id", models.IntegerField()),
+                ("month", models.DateField()),
+                ("answer_count", models.IntegerField(default=0)),
+                ("slider_sum", models.FloatField(default=0)),
+                ("slider_sum_squares", models.FloatField(default=0)),
+                ("histogram", models.JSONField(default=list)),
+                ("promoters", models.IntegerField(default=0)),
+                ("passives", models.IntegerField(default=0)),
+                ("detractors", models.IntegerField(default=0)),
+                (
+                    "employee_group",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="medarbetarapp.employeegroup",
+                    ),
+                ),
+                (
+                    "organization",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="score_rollups",
+                        to="medarbetarapp.organization",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["organization", "lineage_id", "month"],
+                        name="medarbetara_organiz_882a4b_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("employee_group__isnull", False)),
+                        fields=(
+                            "organization",
+                            "employee_group",
+                            "lineage_id",
+                            "month",
+                        ),
+                        name="unique_group_score_rollup",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("employee_group__isnull", True)),
+                        fields=("organization", "lineage_id", "month"),
+                        name="unique_organization_score_rollup",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("medarbetarapp", "0038_scorerollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TextAnalysis",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[
+                            ("free_text", "Free text answer"),
+                            ("comment", "Comment"),
+                        ],
+                        max_length=15,
+                    ),
+                ),
+                ("keywords", models.JSONField(default=list)),
+                ("bigrams", models.JSONField(default=list)),
+                ("sentiment", models.FloatField(default=0)),
+                (
+                    "answer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="text_analyses",
+                        to="medarbetarapp.answer",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("answer", "source"), name="unique_answer_text_analysis"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,83 @@
+from django.db import migrations
+
+# An external content FTS5 table over the text columns of medarbetarapp_answer.
+# The triggers keep it in sync on every write, including bulk_create and
+# update() which do not send signals. Diacritics are kept so å, ä and ö are
+# not folded into a and o.
+CREATE_SEARCH_INDEX = [
+    """
+    CREATE VIRTUAL TABLE medarbetarapp_answer_search USING fts5(
+        free_text_answer,
+        comment,
+        content='medarbetarapp_answer',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 0'
+    )
+    """,
+    """
+    CREATE TRIGGER medarbetarapp_answer_search_insert
+    AFTER INSERT ON medarbetarapp_answer BEGIN
+        INSERT INTO medarbetarapp_answer_search (rowid, free_text_answer, comment)
+        VALUES (new.id, new.free_text_answer, new.comment);
+    END
+    """,
+    """
+    CREATE TRIGGER medarbetarapp_answer_search_delete
+    AFTER DELETE ON medarbetarapp_answer BEGIN
+        INSERT INTO medarbetarapp_answer_search
+            (medarbetarapp_answer_search, rowid, free_text_answer, comment)
+        VALUES ('delete', old.id, old.free_text_answer, old.comment);
+    END
+    """,
+    """
+    CREATE TRIGGER medarbetarapp_answer_search_update
+    AFTER UPDATE OF free_text_answer, comment ON medarbetarapp_answer BEGIN
+        INSERT INTO medarbetarapp_answer_search
+            (medarbetarapp_answer_search, rowid, free_text_answer, comment)
+        VALUES ('delete', old.id, old.free_text_answer, old.comment);
+        INSERT INTO medarbetarapp_answer_search (rowid, free_text_answer, comment)
+        VALUES (new.id, new.free_text_answer, new.comment);
+    END
+    """,
+    # Index the answers that already exist
+    """
+    INSERT INTO medarbetarapp_answer_search (medarbetarapp_answer_search)
+    VALUES ('rebuild')
+    """,
+]
+
+DROP_SEARCH_INDEX = [
+    "DROP TRIGGER IF EXISTS medarbetarapp_answer_search_insert",
+    "DROP TRIGGER IF EXISTS medarbetarapp_answer_search_delete",
+    "DROP TRIGGER IF EXISTS medarbetarapp_answer_search_update",
+    "DROP TABLE IF EXISTS medarbetarapp_answer_search",
+]
+
+
+def create_search_index(apps, schema_editor):
+    """
+    FTS5 only exists in SQLite, other databases search with a plain LIKE
+    (see answer_search.search_answers).
+    """
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in CREATE_SEARCH_INDEX:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in DROP_SEARCH_INDEX:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("medarbetarapp", "0039_textanalysis"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("medarbetarapp", "0040_answer_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="survey",
+            name="last_answered_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
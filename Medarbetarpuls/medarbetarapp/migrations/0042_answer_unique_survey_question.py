@@ -0,0 +1,60 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:44
+
+from importlib import import_module
+
+from django.db import migrations, models
+from django.db.models import Count
+
+answer_search_index = import_module("medarbetarapp.migrations.0040_answer_search_index")
+
+
+def remove_duplicate_answers(apps, schema_editor):
+    """
+    Answering question by question could save more than one answer for the
+    same question. Keeps the latest answered one (or the latest one if none
+    is answered) so the unique constraint can be added.
+    """
+    Answer = apps.get_model("medarbetarapp", "Answer")
+
+    duplicates = (
+        Answer.objects.filter(survey__isnull=False, question__isnull=False)
+        .values("survey_id", "question_id")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        answers = Answer.objects.filter(
+            survey_id=duplicate["survey_id"], question_id=duplicate["question_id"]
+        ).order_by("-is_answered", "-id")
+        keep = answers.values_list("id", flat=True)[0]
+        answers.exclude(id=keep).delete()
+
+
+def recreate_search_index(apps, schema_editor):
+    """
+    On SQLite, adding or removing the constraint copies medarbetarapp_answer
+    to a new table, which drops the search triggers from 0040_answer_search_index.
+    Recreates them and reindexes the answers.
+    """
+    answer_search_index.drop_search_index(apps, schema_editor)
+    answer_search_index.create_search_index(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("medarbetarapp", "0041_survey_last_answered_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_answers, migrations.RunPython.noop),
+        # Runs after the constraint is removed when migrating backwards
+        migrations.RunPython(migrations.RunPython.noop, recreate_search_index),
+        migrations.AddConstraint(
+            model_name="answer",
+            constraint=models.UniqueConstraint(
+                fields=("survey", "question"), name="unique_survey_question_answer"
+            ),
+        ),
+        migrations.RunPython(recreate_search_index, migrations.RunPython.noop),
+    ]
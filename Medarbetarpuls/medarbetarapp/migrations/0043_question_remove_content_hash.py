@@ -0,0 +1,17 @@
+# Generated by Django 5.1.7 on 2026-10-17 05:21
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("medarbetarapp", "0042_answer_unique_survey_question"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="question",
+            name="content_hash",
+        ),
+    ]
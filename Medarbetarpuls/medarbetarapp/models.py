@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.db import models, transaction
+from django.core.cache import cache
 from django.core.mail import send_mail
 from django.db.models.manager import BaseManager
 from django.contrib.auth.models import (
@@ -6,12 +8,39 @@ from django.contrib.auth.models import (
     BaseUserManager,
     PermissionsMixin,
 )
+import math
+import time
 import logging
-from typing import cast
+from typing import Iterable, cast
 from django.utils import timezone
+from django.db.models import (
+    Count,
+    DateField,
+    F,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Sum,
+)
+from django.db.models.functions import Coalesce, TruncMonth
+from .text_analysis import analyze_texts
 
 logger = logging.getLogger(__name__)
 
+# Answers given question by question are kept as drafts in the cache and
+# written to the database when the survey is submitted or left
+ANSWER_DRAFT_TIMEOUT = 60 * 60 * 24 * 7
+# Drafts that have not changed for this long are written by the periodic flush
+ANSWER_DRAFT_IDLE_FLUSH = 30 * 60
+ANSWER_DRAFT_FIELDS = (
+    "comment",
+    "free_text_answer",
+    "multiple_choice_answer",
+    "yes_no_answer",
+    "slider_answer",
+)
+
 # Define explicit type aliases to help with readability
 OneToManyManager = BaseManager  # Alias for ForeignKey reverse relations
 ManyToManyManager = BaseManager  # Alias for ManyToManyField relations
@@ -171,6 +200,17 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):  # pyright: ignore
     def get_answered_surveys(self):
         return self.survey_results.filter(is_answered=True)
 
+    # To get the ids of the groups this user has published at least one survey to,
+    # as a subquery so e.g. survey_groups.filter(id__in=...) stays one query
+    def get_published_group_ids(self) -> QuerySet:
+        return (
+            Survey.employee_groups.through.objects.filter(
+                survey__creator=self, survey__published_count__gt=0
+            )
+            .values("employeegroup_id")
+            .distinct()
+        )
+
 
 # Below are models for surveys and their results
 
@@ -227,6 +267,8 @@ class Survey(models.Model):
     )  # stores both date and time (e.g., YYYY-MM-DD HH:MM:SS)
     last_notification = models.DateTimeField()
     collected_answer_count = models.IntegerField(default=0)  # pyright: ignore
+    # When the latest result was submitted, the Last-Modified of the result pages
+    last_answered_at = models.DateTimeField(null=True, blank=True)
     published_count = models.IntegerField(default=0)  # pyright: ignore
     is_viewable = models.BooleanField(default=True)  # pyright: ignore
     is_anonymous = models.BooleanField(default=True)  # pyright: ignore
@@ -237,31 +279,45 @@ class Survey(models.Model):
     def publish_survey(self):
         """
         Publishes the survey to all employees in all
-        employee groups linked to this survey
+        employee groups linked to this survey. Every result
+        remembers which groups its employee belonged to when
+        the survey was published.
         """
-        seen_employees = set()
-        count: int = 0
+        employees = list(
+            CustomUser.objects.filter(employee_groups__in=self.employee_groups.all())
+            .distinct()
+            .prefetch_related("employee_groups")
+        )
 
-        for group in self.employee_groups.all():
-            for employee in group.employees.all():
-                if employee.id not in seen_employees:
-                    SurveyUserResult.objects.create(
-                        published_survey=self, user=employee
+        with transaction.atomic():
+            results = SurveyUserResult.objects.bulk_create(
+                [
+                    SurveyUserResult(published_survey=self, user=employee)
+                    for employee in employees
+                ]
+            )
+            ResultGroup = SurveyUserResult.employee_groups.through
+            ResultGroup.objects.bulk_create(
+                [
+                    ResultGroup(
+                        surveyuserresult_id=result.id, employeegroup_id=group.id
                     )
-                    seen_employees.add(employee)
-                    count += 1
+                    for result, employee in zip(results, employees)
+                    for group in employee.employee_groups.all()
+                ]
+            )
 
-        # Saves the amount of users this survey has been sent to
-        self.published_count = count
-        self.last_notification = timezone.now()
-        self.save()
+            # Saves the amount of users this survey has been sent to
+            self.published_count = len(employees)
+            self.last_notification = timezone.now()
+            self.save()
 
         # Send email to notify
         send_mail(
             subject="Ny obesvaradenkät",
             message="Det finns en ny enkät att svara på i Medarbetarpuls",
             from_email="medarbetarpuls@gmail.com",
-            recipient_list=[employee.email for employee in seen_employees],
+            recipient_list=[employee.email for employee in employees],
             fail_silently=False,
         )
 
@@ -317,10 +373,201 @@ class SurveyUserResult(models.Model):
     user = models.ForeignKey(
         CustomUser, on_delete=models.CASCADE, related_name="survey_results", null=True
     )
+    # The groups the user belonged to when the survey was published, so group
+    # analysis does not change when people later change groups
+    employee_groups = models.ManyToManyField(
+        EmployeeGroup, related_name="survey_results", blank=True
+    )
+    # Set when the answers of this (submitted) result are added to the ScoreRollup
+    rolled_up = models.BooleanField(default=False, db_index=True)  # pyright: ignore
 
     def __str__(self) -> str:
         return f"{self.user} ({self.is_answered})"
 
+    def submit(self) -> bool:
+        """
+        Marks this result as answered and folds its answers into the
+        question statistics. Everything happens in one transaction, and
+        a result that already is answered is not counted twice.
+
+        Returns:
+            bool: True if the result was submitted now, False if it already was answered
+        """
+        with transaction.atomic():
+            submitted = SurveyUserResult.objects.filter(
+                id=self.id, is_answered=False
+            ).update(is_answered=True)
+            self.is_answered = True
+            if not submitted:
+                return False
+
+            Survey.objects.filter(id=self.published_survey_id).update(
+                collected_answer_count=F("collected_answer_count") + 1,
+                last_answered_at=timezone.now(),
+            )
+            QuestionStats.record_result(self)
+        return True
+
+    def submit_answers(self, answers: list["Answer"]) -> bool:
+        """
+        Saves all answers of this result at once and submits it, in one
+        transaction. Answers that already were saved for a question (e.g.
+        by answering question by question) are overwritten.
+
+        Args:
+            answers (list[Answer]): Unsaved answers, at most one per question
+
+        Returns:
+            bool: True if the result was submitted now, False if it already was
+            answered, in which case nothing is saved
+        """
+        with transaction.atomic():
+            self._upsert_answers(answers)
+            if not self.submit():
+                transaction.set_rollback(True)
+                return False
+
+        # The drafts are saved now
+        self._delete_drafts(answer.question_id for answer in answers)
+        return True
+
+    def _upsert_answers(self, answers: list["Answer"]) -> None:
+        """
+        Saves answers of this result with one query, overwriting the
+        answers that already exist for their questions.
+        """
+        # bulk_create does not call Answer.save(), and existing answers are
+        # matched by their question instead of their id
+        for answer in answers:
+            answer.pk = None
+            answer.survey = self
+            answer.is_answered = True
+            answer.multiple_choice_mask = multiple_choice_mask(
+                answer.multiple_choice_answer
+            )
+
+        Answer.objects.bulk_create(
+            answers,
+            update_conflicts=True,
+            unique_fields=["survey", "question"],
+            update_fields=["is_answered", "multiple_choice_mask"]
+            + list(ANSWER_DRAFT_FIELDS),
+        )
+
+    def _draft_key(self, question_id: int) -> str:
+        return f"answer-draft:{self.id}:{question_id}"
+
+    def _drafts_updated_key(self) -> str:
+        return f"answer-drafts-updated:{self.id}"
+
+    def save_draft(self, answer: "Answer") -> None:
+        """
+        Keeps an answer in the cache instead of writing it to the database,
+        until the result is submitted or left (see flush_drafts).
+
+        Without a shared cache (see settings.ANSWER_DRAFTS_IN_CACHE) the answer
+        is written to the database directly.
+
+        Raises:
+            ValidationError: If a value can not be converted to its field type
+        """
+        draft = {
+            name: Answer._meta.get_field(name).to_python(getattr(answer, name))
+            for name in ANSWER_DRAFT_FIELDS
+        }
+        if not settings.ANSWER_DRAFTS_IN_CACHE:
+            self._upsert_answers([Answer(question_id=answer.question_id, **draft)])
+            return
+
+        cache.set_many(
+            {
+                self._draft_key(answer.question_id): draft,
+                self._drafts_updated_key(): time.time(),
+            },
+            ANSWER_DRAFT_TIMEOUT,
+        )
+
+    def get_drafts(self, questions: Iterable["Question"]) -> dict[int, "Answer"]:
+        """
+        Gets the drafts of the given questions of this result.
+
+        Returns:
+            dict[int, Answer]: Unsaved answers by question id
+        """
+        if not settings.ANSWER_DRAFTS_IN_CACHE:
+            return {}
+        questions = {self._draft_key(question.id): question for question in questions}
+        return {
+            questions[key].id: Answer(
+                survey=self, question=questions[key], is_answered=True, **draft
+            )
+            for key, draft in cache.get_many(questions.keys()).items()
+        }
+
+    def flush_drafts(self, questions: Iterable["Question"]) -> int:
+        """
+        Writes the drafts of this result to the database in one transaction.
+        Drafts of a result that already is submitted are thrown away.
+
+        Args:
+            questions (Iterable[Question]): The questions of the survey
+
+        Returns:
+            int: The number of answers that were written
+        """
+        drafts = self.get_drafts(questions)
+        written = 0
+        if drafts:
+            with transaction.atomic():
+                if SurveyUserResult.objects.filter(
+                    id=self.id, is_answered=False
+                ).exists():
+                    self._upsert_answers(list(drafts.values()))
+                    written = len(drafts)
+
+        self._delete_drafts(drafts.keys())
+        return written
+
+    def _delete_drafts(self, question_ids: Iterable[int]) -> None:
+        cache.delete_many(
+            [self._draft_key(question_id) for question_id in question_ids]
+            + [self._drafts_updated_key()]
+        )
+
+    @classmethod
+    def flush_idle_drafts(cls, idle_seconds: int = ANSWER_DRAFT_IDLE_FLUSH) -> int:
+        """
+        Writes the drafts of results that have not been answered for a while
+        to the database, e.g. when someone closed the browser mid survey.
+        Drafts of surveys past their deadline are left to expire, the report
+        of such a survey only includes submitted results.
+
+        Args:
+            idle_seconds (int, optional): Only flush results whose drafts have not
+                changed for this many seconds. Defaults to ANSWER_DRAFT_IDLE_FLUSH.
+
+        Returns:
+            int: The number of answers that were written
+        """
+        results = list(
+            cls.objects.filter(
+                is_answered=False, published_survey__deadline__gt=timezone.now()
+            ).only("id", "published_survey_id")
+        )
+
+        updated = cache.get_many([result._drafts_updated_key() for result in results])
+        idle_before = time.time() - idle_seconds
+        flushed = 0
+        for result in results:
+            updated_at = updated.get(result._drafts_updated_key())
+            if updated_at is not None and updated_at <= idle_before:
+                flushed += result.flush_drafts(
+                    Question.objects.filter(
+                        connected_surveys=result.published_survey_id
+                    )
+                )
+        return flushed
+
 
 class BaseQuestionDetails(models.Model):
     """
@@ -411,6 +658,10 @@ class Question(models.Model):
     )
     bank_question_tag = models.IntegerField(null=True, blank=True)
 
+    # Id of the template or bank question this question was cloned from. All survey
+    # instances of the same question share it, also if the wording is edited later.
+    lineage_id = models.IntegerField(null=True, blank=True, db_index=True)
+
     # All questions tyoe possible
     slider_question = models.OneToOneField(
         SliderQuestion, on_delete=models.CASCADE, null=True, blank=True
@@ -450,6 +701,9 @@ class Question(models.Model):
             # Add link to question bank
             data["bank_question"] = data.get("bank_question")
 
+            # Every copy points back to the original question (copies of copies keep the root)
+            data["lineage_id"] = self.lineage_key
+
             # Create the new Question, pointing at the new survey
             new_q = Question.objects.create(**data)
             # Add link to survey:
@@ -472,6 +726,14 @@ class Question(models.Model):
 
             return new_q
 
+    @property
+    def lineage_key(self) -> int:
+        """
+        The id shared by all instances of this question across surveys. This is the
+        id of the question it was cloned from, or its own id if it is an original.
+        """
+        return self.lineage_id if self.lineage_id is not None else self.id
+
     @property
     def specific_question(self) -> BaseQuestionDetails | None:
         """
@@ -503,6 +765,24 @@ class Question(models.Model):
         return f"{self.question_format} ({self.question})"
 
 
+# Multiple choice selections are stored in a signed 64 bit integer
+MAX_MULTIPLE_CHOICE_OPTIONS = 63
+
+
+def multiple_choice_mask(selected_options: list | None) -> int | None:
+    """
+    Pack a list of selected multiple choice options into an integer, where
+    bit i is set if option i is selected. Options beyond the first 63 are ignored.
+    """
+    if not selected_options:
+        return None
+    mask = 0
+    for idx, selected in enumerate(selected_options[:MAX_MULTIPLE_CHOICE_OPTIONS]):
+        if selected:
+            mask |= 1 << idx
+    return mask
+
+
 class Answer(models.Model):
     """
     This class saves all information for an answer. Answers
@@ -522,6 +802,8 @@ class Answer(models.Model):
     multiple_choice_answer = models.JSONField(
         default=list, null=True, blank=True
     )  # Stores a list of booleans
+    # The multiple choice answer as a bitmask, so selections can be counted in the database
+    multiple_choice_mask = models.BigIntegerField(null=True, blank=True)
     yes_no_answer = models.BooleanField(null=True, blank=True)  # pyright: ignore
     slider_answer = models.FloatField(null=True, blank=True)
 
@@ -564,10 +846,546 @@ class Answer(models.Model):
         )
         return None
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("survey", "question"), name="unique_survey_question_answer"
+            )
+        ]
+
+    def save(self, *args, **kwargs):
+        self.multiple_choice_mask = multiple_choice_mask(self.multiple_choice_answer)
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "multiple_choice_mask"}
+        super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         return f"{self.survey} ({self.is_answered})"
 
 
+class QuestionStats(models.Model):
+    """
+    This class saves running statistics for the answers of a question,
+    either for all respondents (no employee group) or for the members
+    of one employee group. It is updated when a SurveyUserResult is
+    submitted, so mean, standard deviation, median and eNPS can be
+    read without loading every answer.
+    """
+
+    question = models.ForeignKey(
+        Question, on_delete=models.CASCADE, related_name="stats"
+    )
+    employee_group = models.ForeignKey(
+        EmployeeGroup,
+        on_delete=models.CASCADE,
+        related_name="+",
+        null=True,
+        blank=True,
+    )  # None means all respondents
+    answer_count = models.IntegerField(default=0)  # pyright: ignore
+    slider_count = models.IntegerField(default=0)  # pyright: ignore
+    slider_sum = models.FloatField(default=0)  # pyright: ignore
+    slider_sum_squares = models.FloatField(default=0)  # pyright: ignore
+    # Slider value (as a string, e.g. "7.5") -> number of answers. Slider answers
+    # are given in steps of 0.1, so this stays small and keeps the median exact
+    slider_histogram = models.JSONField(default=dict)
+    multiple_choice_counts = models.JSONField(default=list)  # Count per option
+    yes_count = models.IntegerField(default=0)  # pyright: ignore
+    no_count = models.IntegerField(default=0)  # pyright: ignore
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("question", "employee_group"),
+                condition=Q(employee_group__isnull=False),
+                name="unique_group_question_stats",
+            ),
+            models.UniqueConstraint(
+                fields=("question",),
+                condition=Q(employee_group__isnull=True),
+                name="unique_question_stats",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.question} ({self.employee_group}, {self.answer_count})"
+
+    @classmethod
+    def record_result(cls, survey_result: SurveyUserResult):
+        """
+        Adds all answers of a submitted result to the statistics of
+        their questions, both for all respondents and for every
+        employee group the respondent belonged to when the survey
+        was published. Should be called inside a transaction.
+
+        Args:
+            survey_result (SurveyUserResult): The result that was submitted
+        """
+        # Not survey_result.answers, which can be prefetched before the
+        # answers saved on submit
+        answers = list(Answer.objects.filter(survey=survey_result))
+        if not answers:
+            return
+
+        group_ids = [None]
+        group_ids += list(survey_result.employee_groups.values_list("id", flat=True))
+        question_ids = {answer.question_id for answer in answers}
+
+        # Create missing rows first, then lock and update all of them
+        cls.objects.bulk_create(
+            [
+                cls(question_id=question_id, employee_group_id=group_id)
+                for question_id in question_ids
+                for group_id in group_ids
+            ],
+            ignore_conflicts=True,
+        )
+        group_filter = Q(employee_group__isnull=True) | Q(
+            employee_group_id__in=group_ids[1:]
+        )
+        stats = (
+            cls.objects.select_for_update()
+            .filter(group_filter, question_id__in=question_ids)
+            .order_by("id")
+        )
+
+        answers_by_question = {}
+        for answer in answers:
+            answers_by_question.setdefault(answer.question_id, []).append(answer)
+        for stat in stats:
+            for answer in answers_by_question[stat.question_id]:
+                stat.add_answer(answer)
+
+        cls.objects.bulk_update(
+            stats,
+            [
+                "answer_count",
+                "slider_count",
+                "slider_sum",
+                "slider_sum_squares",
+                "slider_histogram",
+                "multiple_choice_counts",
+                "yes_count",
+                "no_count",
+            ],
+        )
+
+    def add_answer(self, answer: "Answer"):
+        """
+        Adds a single answer to the running statistics (without saving).
+        """
+        self.answer_count += 1
+
+        if answer.slider_answer is not None:
+            value = float(answer.slider_answer)
+            self.slider_count += 1
+            self.slider_sum += value
+            self.slider_sum_squares += value * value
+            key = str(value)
+            self.slider_histogram[key] = self.slider_histogram.get(key, 0) + 1
+
+        if answer.yes_no_answer is True:
+            self.yes_count += 1
+        elif answer.yes_no_answer is False:
+            self.no_count += 1
+
+        if answer.multiple_choice_answer:
+            selected_options = answer.multiple_choice_answer
+            missing = len(selected_options) - len(self.multiple_choice_counts)
+            if missing > 0:
+                self.multiple_choice_counts.extend([0] * missing)
+            for idx, selected in enumerate(selected_options):
+                if selected:
+                    self.multiple_choice_counts[idx] += 1
+
+    @property
+    def histogram(self) -> dict[float, int]:
+        """
+        The slider histogram with numeric keys.
+        """
+        return {float(value): count for value, count in self.slider_histogram.items()}
+
+    @property
+    def mean(self) -> float:
+        """
+        Mean of the slider answers, read from the running sum.
+        """
+        if self.slider_count == 0:
+            return 0.0
+        return self.slider_sum / self.slider_count
+
+    @property
+    def standard_deviation(self) -> float:
+        """
+        Population standard deviation of the slider answers, read from the running sums.
+        """
+        if self.slider_count == 0:
+            return 0.0
+        variance = self.slider_sum_squares / self.slider_count - self.mean**2
+        return round(math.sqrt(max(variance, 0.0)), 2)
+
+    @property
+    def variation_coefficient(self) -> float:
+        """
+        Coefficient of variation (in percent) of the slider answers.
+        """
+        if self.slider_count == 0 or self.mean == 0:
+            return 0.0
+        variance = self.slider_sum_squares / self.slider_count - self.mean**2
+        return round(math.sqrt(max(variance, 0.0)) / self.mean * 100, 2)
+
+    @property
+    def median(self) -> float:
+        """
+        Median of the slider answers, read from the histogram.
+        """
+        histogram = self.histogram
+        lower_rank, upper_rank = (self.slider_count - 1) // 2, self.slider_count // 2
+        lower = None
+        seen = 0
+        for value in sorted(histogram):
+            seen += histogram[value]
+            if lower is None and seen > lower_rank:
+                lower = value
+            if seen > upper_rank:
+                return round((lower + value) / 2, 2)
+        return 0.0
+
+    @property
+    def enps_data(self) -> tuple[int, int, int]:
+        """
+        Number of promoters (>= 9), passives (7 to 9) and detractors (< 7).
+        """
+        promoters = passives = detractors = 0
+        for value, count in self.histogram.items():
+            if value >= 9:
+                promoters += count
+            elif value >= 7:
+                passives += count
+            else:
+                detractors += count
+        return promoters, passives, detractors
+
+
+class SurveyReport(models.Model):
+    """
+    This class saves the final answer aggregates of a survey,
+    computed once when its deadline has passed. Analysis of a
+    closed survey reads this snapshot instead of the answers.
+    """
+
+    survey = models.OneToOneField(
+        Survey, on_delete=models.CASCADE, related_name="report"
+    )
+    created_at = models.DateTimeField(auto_now=True)
+    # The collected_answer_count the report was computed for. If more
+    # answers arrive anyway the report is outdated and not used.
+    answer_count = models.IntegerField(default=0)  # pyright: ignore
+    # "all" or an employee group id -> question id -> answer aggregate
+    aggregates = models.JSONField(default=dict)
+
+    def __str__(self) -> str:
+        return f"Report for {self.survey}"
+
+
+class ScoreRollup(models.Model):
+    """
+    This class saves slider (and eNPS) statistics per organization,
+    employee group, question lineage and month, so trends over long
+    periods can be read from a few rows instead of every answer. The
+    rows are updated incrementally with the results that were
+    submitted since the last refresh.
+    """
+
+    organization = models.ForeignKey(
+        Organization, on_delete=models.CASCADE, related_name="score_rollups"
+    )
+    employee_group = models.ForeignKey(
+        EmployeeGroup,
+        on_delete=models.CASCADE,
+        related_name="+",
+        null=True,
+        blank=True,
+    )  # None means the whole organization
+    lineage_id = models.IntegerField()  # Question.lineage_key
+    month = models.DateField()  # First day of the month the survey was sent
+    answer_count = models.IntegerField(default=0)  # pyright: ignore
+    slider_sum = models.FloatField(default=0)  # pyright: ignore
+    slider_sum_squares = models.FloatField(default=0)  # pyright: ignore
+    # Number of answers per slider value 0 to 10 (rounded to the closest integer)
+    histogram = models.JSONField(default=list)
+    promoters = models.IntegerField(default=0)  # pyright: ignore
+    passives = models.IntegerField(default=0)  # pyright: ignore
+    detractors = models.IntegerField(default=0)  # pyright: ignore
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("organization", "employee_group", "lineage_id", "month"),
+                condition=Q(employee_group__isnull=False),
+                name="unique_group_score_rollup",
+            ),
+            models.UniqueConstraint(
+                fields=("organization", "lineage_id", "month"),
+                condition=Q(employee_group__isnull=True),
+                name="unique_organization_score_rollup",
+            ),
+        ]
+        indexes = [models.Index(fields=("organization", "lineage_id", "month"))]
+
+    @classmethod
+    def refresh(cls, batch_size: int = 500) -> int:
+        """
+        Adds the slider answers of all submitted results that are not
+        rolled up yet, one batch of results (and one transaction) at a time.
+
+        Args:
+            batch_size (int): Number of results per batch
+
+        Returns:
+            int: Number of results that were rolled up
+        """
+        total = 0
+        while True:
+            with transaction.atomic():
+                result_ids = list(
+                    SurveyUserResult.objects.select_for_update(skip_locked=True)
+                    .filter(is_answered=True, rolled_up=False)
+                    .values_list("id", flat=True)[:batch_size]
+                )
+                if not result_ids:
+                    return total
+                cls._add_results(result_ids)
+                SurveyUserResult.objects.filter(id__in=result_ids).update(
+                    rolled_up=True
+                )
+            total += len(result_ids)
+
+    @classmethod
+    def _add_results(cls, result_ids: list[int]):
+        answers = Answer.objects.filter(
+            survey_id__in=result_ids,
+            question__question_format=QuestionFormat.SLIDER,
+            slider_answer__isnull=False,
+        ).annotate(
+            lineage=Coalesce(
+                "question__lineage_id",
+                "question_id",
+                output_field=models.IntegerField(),
+            ),
+            month=TruncMonth(
+                "survey__published_survey__sending_date", output_field=DateField()
+            ),
+        )
+        statistics = {
+            "answer_count": Count("id"),
+            "slider_sum": Sum("slider_answer"),
+            "slider_sum_squares": Sum(F("slider_answer") * F("slider_answer")),
+            "promoters": Count("id", filter=Q(slider_answer__gte=9)),
+            "passives": Count(
+                "id", filter=Q(slider_answer__gte=7, slider_answer__lt=9)
+            ),
+            "detractors": Count("id", filter=Q(slider_answer__lt=7)),
+            **{
+                f"bucket_{value}": Count(
+                    "id",
+                    filter=Q(
+                        slider_answer__gte=value - 0.5, slider_answer__lt=value + 0.5
+                    ),
+                )
+                for value in range(11)
+            },
+        }
+
+        # The organization of a survey is the organization of the groups it was sent to
+        survey_organization = Subquery(
+            Survey.employee_groups.through.objects.filter(
+                survey_id=OuterRef("survey__published_survey_id")
+            ).values("employeegroup__organization_id")[:1]
+        )
+        rows = list(
+            answers.annotate(organization=survey_organization)
+            .values("organization", "lineage", "month")
+            .annotate(**statistics)
+            .order_by()
+        )
+        rows += list(
+            answers.filter(survey__employee_groups__isnull=False)
+            .annotate(
+                organization=F("survey__employee_groups__organization_id"),
+                group=F("survey__employee_groups"),
+            )
+            .values("organization", "group", "lineage", "month")
+            .annotate(**statistics)
+            .order_by()
+        )
+        rows = [row for row in rows if row["organization"] is not None]
+        if not rows:
+            return
+
+        # A refresh running at the same time may add the same rows, so missing
+        # rows are inserted empty (skipping conflicts) and then locked and added to
+        cls.objects.bulk_create(
+            [
+                cls(
+                    organization_id=row["organization"],
+                    employee_group_id=row.get("group"),
+                    lineage_id=row["lineage"],
+                    month=row["month"],
+                    histogram=[0] * 11,
+                )
+                for row in rows
+            ],
+            ignore_conflicts=True,
+        )
+        rollups = {
+            (r.organization_id, r.employee_group_id, r.lineage_id, r.month): r
+            for r in cls.objects.select_for_update().filter(
+                organization_id__in={row["organization"] for row in rows},
+                lineage_id__in={row["lineage"] for row in rows},
+                month__in={row["month"] for row in rows},
+            )
+        }
+        for row in rows:
+            rollup = rollups[
+                (row["organization"], row.get("group"), row["lineage"], row["month"])
+            ]
+            rollup.answer_count += row["answer_count"]
+            rollup.slider_sum += row["slider_sum"]
+            rollup.slider_sum_squares += row["slider_sum_squares"]
+            rollup.promoters += row["promoters"]
+            rollup.passives += row["passives"]
+            rollup.detractors += row["detractors"]
+            rollup.histogram = [
+                count + row[f"bucket_{value}"]
+                for value, count in enumerate(rollup.histogram)
+            ]
+
+        cls.objects.bulk_update(
+            rollups.values(),
+            [
+                "answer_count",
+                "slider_sum",
+                "slider_sum_squares",
+                "histogram",
+                "promoters",
+                "passives",
+                "detractors",
+            ],
+        )
+
+    @property
+    def mean(self) -> float:
+        """
+        Mean of the slider answers.
+        """
+        if self.answer_count == 0:
+            return 0.0
+        return self.slider_sum / self.answer_count
+
+    @property
+    def standard_deviation(self) -> float:
+        """
+        Standard deviation of the slider answers.
+        """
+        if self.answer_count == 0:
+            return 0.0
+        variance = self.slider_sum_squares / self.answer_count - self.mean**2
+        return math.sqrt(max(variance, 0.0))
+
+    @property
+    def enps_score(self) -> int:
+        """
+        The eNPS score, floor((promoters - detractors) / answers * 100).
+        """
+        if self.answer_count == 0:
+            return 0
+        return math.floor((self.promoters - self.detractors) / self.answer_count * 100)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.organization} {self.employee_group} {self.lineage_id} {self.month}"
+        )
+
+
+class TextAnalysis(models.Model):
+    """
+    This class saves the text analysis (keywords, bigrams and
+    sentiment) of the free text answer or the comment of an answer.
+    Texts are analyzed once in the background (see text_analysis.py),
+    so themes can be shown without scanning the texts again.
+    """
+
+    class Source(models.TextChoices):
+        FREE_TEXT = "free_text", "Free text answer"
+        COMMENT = "comment", "Comment"
+
+    answer = models.ForeignKey(
+        Answer, on_delete=models.CASCADE, related_name="text_analyses"
+    )
+    source = models.CharField(max_length=15, choices=Source.choices)
+    keywords = models.JSONField(default=list)
+    bigrams = models.JSONField(default=list)
+    sentiment = models.FloatField(default=0)  # pyright: ignore
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("answer", "source"), name="unique_answer_text_analysis"
+            )
+        ]
+
+    @classmethod
+    def process_pending(cls, batch_size: int = 5000) -> int:
+        """
+        Analyzes all texts of submitted answers that have not been
+        analyzed yet, one batch at a time.
+
+        Args:
+            batch_size (int): Number of texts per batch
+
+        Returns:
+            int: Number of texts that were analyzed
+        """
+        total = 0
+        while True:
+            texts = []
+            for source, field in (
+                (cls.Source.FREE_TEXT, "free_text_answer"),
+                (cls.Source.COMMENT, "comment"),
+            ):
+                pending = (
+                    Answer.objects.filter(survey__is_answered=True)
+                    .exclude(**{f"{field}__isnull": True})
+                    .exclude(**{field: ""})
+                    .exclude(text_analyses__source=source)
+                    .values_list("id", field)
+                    .order_by("id")[: batch_size - len(texts)]
+                )
+                texts += [((answer_id, source), text) for answer_id, text in pending]
+            if not texts:
+                return total
+
+            analyses = analyze_texts(texts)
+            cls.objects.bulk_create(
+                [
+                    cls(
+                        answer_id=answer_id,
+                        source=source,
+                        keywords=analysis["keywords"],
+                        bigrams=analysis["bigrams"],
+                        sentiment=analysis["sentiment"],
+                    )
+                    for (answer_id, source), analysis in analyses.items()
+                ],
+                ignore_conflicts=True,
+            )
+            total += len(texts)
+
+    def __str__(self) -> str:
+        return f"{self.answer} ({self.source})"
+
+
 class EmailList(models.Model):
     """
     This class saves all information necessary when adding
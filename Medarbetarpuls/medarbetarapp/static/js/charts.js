@@ -456,3 +456,139 @@ function initAnswerFrequency(chartID, chartData, dataChange) {
   ctx.font = "30px sans-serif";
   ctx.fillText(chartData + "%", centerX, centerY + 10);
 }
+
+async function fetchChartData(panel, params) {
+  /**
+   * Fetches the data of one analysis chart panel as JSON.
+   *
+   * The endpoint sends an ETag and "Cache-Control: no-cache", so the browser
+   * keeps the response and revalidates it; unchanged data comes back as a
+   * 304 and is served from the browser cache.
+   *
+   * Args:
+   * panel (str): participation, distribution or trend.
+   * params (Object): The analysis filters (group_id, surveys, user_id, question_id).
+   *
+   * Returns:
+   * Promise<Object>: The panel data, or null if the request failed.
+   */
+  const query = new URLSearchParams(
+    Object.entries(params).filter(([, value]) => value)
+  );
+  const response = await fetch(`/analysis/data/${panel}/?${query}`, {
+    headers: { Accept: "application/json" },
+    cache: "no-cache",
+  });
+  if (!response.ok) {
+    console.warn(`Could not load the ${panel} panel (${response.status}).`);
+    return null;
+  }
+  return response.json();
+}
+
+function redrawChart(fn, chartID, ...args) {
+  /**
+   * Draws a chart again on a canvas that may already hold one.
+   *
+   * Args:
+   * fn (Function): One of the init functions above.
+   * chartID (str): The ID of the canvas element.
+   * args: The remaining arguments of fn.
+   *
+   * Returns:
+   * No return value; does nothing if the canvas is not on the page.
+   */
+  const canvas = document.getElementById(chartID);
+  if (!canvas) return;
+  const existing = Chart.getChart(canvas);
+  if (existing) existing.destroy();
+  fn(chartID, ...args);
+}
+
+function setText(elementID, text) {
+  const element = document.getElementById(elementID);
+  if (element) element.textContent = text;
+}
+
+const analysisPanelRenderers = {
+  participation(data) {
+    redrawChart(initLineChart, "answerFrequencyTrend", data.survey_sending_dates,
+      data.answer_pct_list, ["rgb(140,214,16)", "rgb(16,23,214)"]);
+    redrawChart(initAnswerFrequency, "responseRateGauge", data.answer_pct_list[0] || 0, 0);
+  },
+
+  distribution(data) {
+    redrawChart(initBarChart, "answerDistributionQuestions", data.answerDistributionLabels,
+      data.answered_counts, ["rgb(140,214,16)", "rgb(16,23,214)"], true);
+  },
+
+  trend(data) {
+    const dates = data.sending_dates_trend || [];
+    const stacked = (distributions) =>
+      dates.map((label, index) => ({ label: label, data: distributions[index] || [] }));
+
+    switch ((data.question_format_trend || [])[0]) {
+      case "enps":
+        redrawChart(initEnpsGauge, "enpsGauge", data.enpsScore_trend[0], 0, dates[0]);
+        redrawChart(initEnpsBar, "enpsBar", data.slider_values_trend[0], data.enpsDistribution_trend[0]);
+        redrawChart(initPieChart, "enpsPieChart", data.enpsPieLabels_trend[0], data.enpsPieData_trend[0],
+          ["rgb(214, 16, 16)", "rgb(248, 149, 28)", "rgb(140, 214, 16)"]);
+        break;
+      case "slider":
+        redrawChart(initStackedBarChart, "sliderStackedBarChart", data.slider_values_trend[0],
+          stacked(data.slider_distribution_trend), ["#8dd3c7", "#ffffb3", "#bebada", "#fb8072", "#80b1d3"]);
+        redrawChart(initLineChart, "lineTrendChartSlider", dates, data.slider_mean_trend,
+          ["rgb(140,214,16)", "rgb(16,23,214)"]);
+        setText("sliderMean", data.slider_mean_trend[0]);
+        setText("sliderStd", data.slider_std_trend[0]);
+        setText("sliderCv", data.slider_cv_trend[0]);
+        setText("sliderMedian", data.slider_median_trend[0]);
+        setText("sliderQuartiles",
+          `Q1 ${data.slider_quartiles_trend[0][0]} – Q3 ${data.slider_quartiles_trend[0][2]}`);
+        break;
+      case "multiplechoice":
+        redrawChart(initStackedBarChart, "barChartMultipleChoice", data.multiple_choice_labels_trend[0],
+          stacked(data.multiple_choice_distribution_trend),
+          ["rgb(85, 214, 16)", "rgb(16, 207, 214)", "rgb(171, 214, 16)",
+           "rgb(178, 16, 214)", "rgb(214, 102, 16)", "rgb(214, 16, 145)"]);
+        break;
+    }
+
+    const themes = document.getElementById("textThemes");
+    if (themes && data.text_themes) {
+      themes.hidden = data.text_themes.text_count === 0;
+      setText("textThemesSummary",
+        `${data.text_themes.text_count} kommentarer, genomsnittlig ton ${data.text_themes.sentiment} (-1 till 1)`);
+      const keywords = document.getElementById("textThemesKeywords");
+      if (keywords) {
+        keywords.replaceChildren(...data.text_themes.keywords.map(([keyword, count]) => {
+          const item = document.createElement("li");
+          item.textContent = `${keyword} (${count})`;
+          return item;
+        }));
+      }
+      setText("textThemesBigrams",
+        data.text_themes.bigrams.map(([bigram, count]) => `${bigram} (${count})`).join(", "));
+    }
+  },
+};
+
+async function refreshAnalysisPanels(panels, params) {
+  /**
+   * Loads the given analysis panels again and redraws their charts, used when a
+   * filter changes that only affects some of the panels.
+   *
+   * Args:
+   * panels (Array <string>): The panels to load, see analysisPanelRenderers.
+   * params (Object): The analysis filters (group_id, surveys, user_id, question_id).
+   *
+   * Returns:
+   * Promise that resolves when all panels are drawn.
+   */
+  await Promise.all(
+    panels.map(async (panel) => {
+      const data = await fetchChartData(panel, params);
+      if (data && Object.keys(data).length) analysisPanelRenderers[panel](data);
+    })
+  );
+}
@@ -0,0 +1,103 @@
+"""
+Column based statistics for survey answers.
+
+The functions in this module work on plain answer columns (as returned by
+``values_list``) instead of model instances.
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Sequence
+
+# Slider answers are bucketed to the closest integer 1 through 10 for the distribution charts
+SLIDER_BUCKETS = 10
+
+
+def slider_statistics(values: Sequence[float]) -> Dict[str, Any]:
+    """
+    Compute the slider statistics for a column of slider answers.
+
+    Args:
+        values (Sequence[float]): The slider answers, without missing values.
+
+    Returns:
+        Dict[str, Any]: A dictionary with keys:
+            - 'mean': Mean slider value (unrounded).
+            - 'standard_deviation': Standard deviation, rounded to two decimals.
+            - 'variation_coefficient': Coefficient of variation, rounded to two decimals.
+            - 'median': Median slider value, rounded to two decimals.
+            - 'distribution': Counts per slider value 1 through 10 (values are rounded to the closest integer).
+            - 'enps': Tuple of (promoters, passives, detractors).
+    """
+    if len(values) == 0:
+        return {
+            "mean": 0.0,
+            "standard_deviation": 0.0,
+            "variation_coefficient": 0.0,
+            "median": 0.0,
+            "distribution": [0] * SLIDER_BUCKETS,
+            "enps": (0, 0, 0),
+        }
+    n = len(values)
+    mean = sum(values) / n
+    standard_deviation = math.sqrt(sum((x - mean) ** 2 for x in values) / n)
+    variation_coefficient = (standard_deviation / mean) * 100 if mean != 0 else 0.0
+
+    distribution = [0] * SLIDER_BUCKETS
+    promoters = passives = detractors = 0
+    for value in values:
+        bucket = math.floor(value + 0.5)
+        if 1 <= bucket <= SLIDER_BUCKETS:
+            distribution[bucket - 1] += 1
+        if value >= 9:
+            promoters += 1
+        elif value >= 7:
+            passives += 1
+        else:
+            detractors += 1
+
+    ordered = sorted(values)
+    median = (ordered[(n - 1) // 2] + ordered[n // 2]) / 2
+
+    return {
+        "mean": mean,
+        "standard_deviation": round(standard_deviation, 2),
+        "variation_coefficient": round(variation_coefficient, 2),
+        "median": round(median, 2),
+        "distribution": distribution,
+        "enps": (promoters, passives, detractors),
+    }
+
+
+def multiple_choice_counts(
+    selections: Iterable[Sequence[bool]], option_count: int
+) -> List[int]:
+    """
+    Count how many times each option of a multiple choice question was selected.
+
+    Args:
+        selections (Iterable[Sequence[bool]]): One list of selected flags per answer.
+        option_count (int): Number of answer options of the question.
+
+    Returns:
+        List[int]: The number of selections per option. Selections beyond the last option are ignored.
+    """
+    counts = [0] * option_count
+    for selected_options in selections:
+        for idx, selected in enumerate(selected_options[:option_count]):
+            if selected:
+                counts[idx] += 1
+    return counts
+
+
+def yes_no_counts(values: Sequence[bool]) -> List[int]:
+    """
+    Count the yes and no answers of a yes/no question.
+
+    Args:
+        values (Sequence[bool]): The yes/no answers, without missing values.
+
+    Returns:
+        List[int]: The number of yes answers followed by the number of no answers.
+    """
+    yes_count = sum(1 for value in values if value)
+    return [yes_count, len(values) - yes_count]
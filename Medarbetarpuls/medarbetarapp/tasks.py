@@ -17,6 +17,64 @@ def publish_survey_async(survey_id: int):
     survey.publish_survey()
 
 
+@shared_task
+def freeze_survey_report(survey_id: int, purge_drafts: bool = False):
+    """
+    This function can be scheduled at the deadline of survey
+    with id survey_id. Computes the final report of the survey
+    once, and can also delete answers that were never submitted.
+    """
+    from .models import Survey  # Avoid circular import
+    from .analysis_handler import AnalysisHandler
+
+    survey: Survey = Survey.objects.get(id=survey_id)
+
+    # The deadline can have been moved since this task was scheduled
+    if survey.deadline > timezone.now():
+        freeze_survey_report.apply_async(
+            args=[survey_id, purge_drafts], eta=survey.deadline
+        )
+        return
+
+    AnalysisHandler().build_survey_report(survey, purge_drafts=purge_drafts)
+
+
+@shared_task
+def refresh_score_rollups():
+    """
+    This function is run periodically (see CELERY_BEAT_SCHEDULE)
+    and adds all results submitted since the last run to the
+    monthly score rollups.
+    """
+    from .models import ScoreRollup  # Avoid circular import
+
+    ScoreRollup.refresh()
+
+
+@shared_task
+def analyze_free_text():
+    """
+    This function is run periodically (see CELERY_BEAT_SCHEDULE)
+    and analyzes the free text answers and comments that were
+    submitted since the last run.
+    """
+    from .models import TextAnalysis  # Avoid circular import
+
+    TextAnalysis.process_pending()
+
+
+@shared_task
+def flush_answer_drafts():
+    """
+    This function is run periodically (see CELERY_BEAT_SCHEDULE)
+    and saves the draft answers of surveys that were left
+    without being submitted or exited, e.g. a closed browser.
+    """
+    from .models import SurveyUserResult  # Avoid circular import
+
+    SurveyUserResult.flush_idle_drafts()
+
+
 @shared_task
 def send_notifications(survey_id: int):
     """
@@ -1,3 +1,757 @@
-from django.test import TestCase
+import math
+import statistics
+from collections import Counter
+from datetime import timedelta
+from importlib import import_module
 
-# Create your tests here.
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from . import models
+from .analysis_handler import AnalysisHandler
+from .answer_search import search_answers
+
+
+class AnswerSurveyTestCase(TestCase):
+    """
+    A published survey with one question of every format, and a
+    logged in employee who has not answered it yet.
+    """
+
+    def setUp(self):
+        org = models.Organization.objects.create(name="Org")
+        self.group = group = models.EmployeeGroup.objects.create(
+            name="Alla", organization=org
+        )
+        self.creator = creator = models.CustomUser.objects.create_user(
+            "creator@example.com", "Creator", "pw", user_role="surveycreator"
+        )
+        self.user = models.CustomUser.objects.create_user(
+            "employee@example.com", "Employee", "pw"
+        )
+        self.user.employee_groups.add(group)
+
+        self.survey = models.Survey.objects.create(
+            name="Puls",
+            creator=creator,
+            deadline=timezone.now() + timedelta(days=7),
+            sending_date=timezone.now(),
+            last_notification=timezone.now(),
+        )
+        self.survey.employee_groups.add(group)
+        options = models.MultipleChoiceQuestion.objects.create(options=["A", "B", "C"])
+        self.questions = [
+            models.Question.objects.create(
+                question="Hur troligt?",
+                question_format=models.QuestionFormat.SLIDER,
+                question_type=models.QuestionType.ENPS,
+            ),
+            models.Question.objects.create(
+                question="Vad gillar du?",
+                question_format=models.QuestionFormat.MULTIPLE_CHOICE,
+                multiple_choice_question=options,
+            ),
+            models.Question.objects.create(
+                question="Mår du bra?", question_format=models.QuestionFormat.YES_NO
+            ),
+            models.Question.objects.create(
+                question="Övrigt?", question_format=models.QuestionFormat.TEXT
+            ),
+        ]
+        self.survey.questions.set(self.questions)
+        self.survey.publish_survey()
+        self.survey_result = self.survey.survey_results.get(user=self.user)
+
+        self.client.force_login(self.user)
+
+    def answer_data(self, question: models.Question, suffix: str = "") -> dict:
+        """
+        The form fields of an answer to a question, with the field names
+        suffixed as in the one page form (e.g. "-12").
+        """
+        data = {f"comment{suffix}": "Kommentar"}
+        if question.question_format == models.QuestionFormat.SLIDER:
+            data[f"slider{suffix}"] = "9"
+        elif question.question_format == models.QuestionFormat.MULTIPLE_CHOICE:
+            data[f"multiplechoice{suffix}"] = ["A", "C"]
+        elif question.question_format == models.QuestionFormat.YES_NO:
+            data[f"yesno{suffix}"] = "True"
+        elif question.question_format == models.QuestionFormat.TEXT:
+            data[f"text{suffix}"] = "Bra kollegor"
+        return data
+
+    def answer_question(self, index: int, submit: bool = False, **changes):
+        question = self.questions[index]
+        data = {
+            "question_format": question.question_format,
+            "action_type": "next",
+            "submit_answers": "submit" if submit else "navigate",
+            **self.answer_data(question),
+            **changes,
+        }
+        return self.client.post(
+            f"/survey/{self.survey_result.id}/question/{index}/",
+            data,
+            HTTP_HX_REQUEST="true",
+        )
+
+    def assertAllQuestionsCounted(self):
+        self.survey_result.refresh_from_db()
+        self.assertTrue(self.survey_result.is_answered)
+        for question in self.questions:
+            stats = models.QuestionStats.objects.get(
+                question=question, employee_group__isnull=True
+            )
+            self.assertEqual(stats.answer_count, 1, question.question)
+
+        stats = models.QuestionStats.objects.get(
+            question=self.questions[0], employee_group__isnull=True
+        )
+        self.assertEqual(stats.slider_sum, 9)
+        stats = models.QuestionStats.objects.get(
+            question=self.questions[1], employee_group__isnull=True
+        )
+        self.assertEqual(stats.multiple_choice_counts, [1, 0, 1])
+
+
+class AnswerSurveyViewTests(AnswerSurveyTestCase):
+    def test_submit_counts_the_answer_of_the_last_question(self):
+        for index in range(len(self.questions) - 1):
+            self.assertEqual(self.answer_question(index).status_code, 200)
+        response = self.answer_question(len(self.questions) - 1, submit=True)
+
+        self.assertEqual(response["HX-Redirect"], "/unanswered-surveys/")
+        self.assertAllQuestionsCounted()
+
+    def test_invalid_answer_is_not_submitted(self):
+        self.answer_question(0)
+        self.answer_question(1)
+        self.answer_question(2, yesno="Kanske")
+        response = self.answer_question(3, submit=True, text="")
+
+        self.assertEqual(response.status_code, 400)
+        self.survey_result.refresh_from_db()
+        self.assertFalse(self.survey_result.is_answered)
+        self.assertFalse(models.QuestionStats.objects.exists())
+
+    def test_malformed_slider_is_rejected(self):
+        response = self.answer_question(0, slider="nio")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(self.survey_result.answers.exists())
+
+    def test_submitting_twice_is_rejected(self):
+        for index in range(len(self.questions) - 1):
+            self.answer_question(index)
+        self.answer_question(len(self.questions) - 1, submit=True)
+
+        response = self.answer_question(len(self.questions) - 1, submit=True)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertAllQuestionsCounted()
+
+    def test_get_does_not_save_an_answer(self):
+        response = self.client.get(f"/survey/{self.survey_result.id}/question/0/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(self.survey_result.answers.exists())
+
+
+@override_settings(ANSWER_DRAFTS_IN_CACHE=True)
+class AnswerSurveyDraftTests(AnswerSurveyTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_navigating_keeps_answers_as_drafts(self):
+        self.answer_question(0)
+
+        self.assertFalse(self.survey_result.answers.exists())
+        response = self.client.get(f"/survey/{self.survey_result.id}/question/0/")
+        self.assertContains(response, 'value="9.0"')
+
+    def test_submit_saves_the_drafts_and_counts_them(self):
+        for index in range(len(self.questions) - 1):
+            self.answer_question(index)
+        self.answer_question(len(self.questions) - 1, submit=True)
+
+        self.assertEqual(self.survey_result.answers.count(), len(self.questions))
+        self.assertAllQuestionsCounted()
+        self.assertEqual(self.survey_result.get_drafts(self.questions), {})
+
+    def test_idle_drafts_are_flushed(self):
+        self.answer_question(0)
+
+        self.assertEqual(models.SurveyUserResult.flush_idle_drafts(), 0)
+        self.assertEqual(models.SurveyUserResult.flush_idle_drafts(idle_seconds=0), 1)
+        self.assertTrue(self.survey_result.answers.filter(slider_answer=9).exists())
+
+
+class AnswerSurveyAllViewTests(AnswerSurveyTestCase):
+    def post_all(self, **changes):
+        data = {}
+        for question in self.questions:
+            data.update(self.answer_data(question, suffix=f"-{question.id}"))
+        data.update(changes)
+        return self.client.post(
+            f"/survey/{self.survey_result.id}/all/", data, HTTP_HX_REQUEST="true"
+        )
+
+    def test_submit_saves_all_answers_and_counts_them(self):
+        response = self.post_all()
+
+        self.assertEqual(response["HX-Redirect"], "/unanswered-surveys/")
+        self.assertEqual(self.survey_result.answers.count(), len(self.questions))
+        self.assertAllQuestionsCounted()
+
+    def test_submit_overwrites_an_answer_given_question_by_question(self):
+        self.answer_question(0, slider="2")
+        self.post_all()
+
+        answer = self.survey_result.answers.get(question=self.questions[0])
+        self.assertEqual(answer.slider_answer, 9)
+        self.assertAllQuestionsCounted()
+
+    def test_invalid_answer_saves_nothing(self):
+        response = self.post_all(**{f"slider-{self.questions[0].id}": "11"})
+
+        self.assertEqual(response.status_code, 400)
+        self.survey_result.refresh_from_db()
+        self.assertFalse(self.survey_result.is_answered)
+        self.assertFalse(self.survey_result.answers.exists())
+
+    def test_submitted_answers_are_searchable(self):
+        self.post_all(**{f"text-{self.questions[3].id}": "Stor arbetsbelastning"})
+
+        results = search_answers("arbets", models.EmployeeGroup.objects.all())
+        self.assertEqual(
+            [result["answer"].question_id for result in results["results"]],
+            [self.questions[3].id],
+        )
+
+
+class PublishedGroupsTests(AnswerSurveyTestCase):
+    def test_newly_published_group_is_listed(self):
+        group = models.EmployeeGroup.objects.create(
+            name="IT", organization=self.group.organization
+        )
+        self.user.employee_groups.add(group)
+        survey = models.Survey.objects.create(
+            name="IT-puls",
+            creator=self.creator,
+            deadline=timezone.now() + timedelta(days=7),
+            sending_date=timezone.now(),
+            last_notification=timezone.now(),
+        )
+        survey.employee_groups.add(group)
+        self.assertNotIn(
+            group.id,
+            self.creator.get_published_group_ids().values_list(
+                "employeegroup_id", flat=True
+            ),
+        )
+
+        survey.publish_survey()
+
+        self.assertEqual(
+            sorted(
+                self.creator.get_published_group_ids().values_list(
+                    "employeegroup_id", flat=True
+                )
+            ),
+            [self.group.id, group.id],
+        )
+
+
+class AnalysisETagTests(AnswerSurveyTestCase):
+    def setUp(self):
+        super().setUp()
+        self.creator.survey_groups.add(self.group)
+        self.client.force_login(self.creator)
+
+        # Scheduled, so not published yet
+        self.scheduled = models.Survey.objects.create(
+            name="Nästa puls",
+            creator=self.creator,
+            deadline=timezone.now() + timedelta(days=14),
+            sending_date=timezone.now() + timedelta(days=7),
+            last_notification=timezone.now(),
+        )
+        self.scheduled.employee_groups.add(self.group)
+
+    def assertChangesWhenPublished(self, url: str):
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.scheduled.publish_survey()
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_analysis_data_changes_when_a_survey_is_published(self):
+        self.assertChangesWhenPublished(
+            f"/analysis/data/participation/?group_id={self.group.id}&surveys=all"
+        )
+
+    def test_analysis_page_changes_when_a_survey_is_published(self):
+        self.assertChangesWhenPublished(
+            f"/analysis/?group_id={self.group.id}&surveys=all"
+        )
+
+    def test_survey_result_changes_when_the_survey_is_published(self):
+        self.assertChangesWhenPublished(f"/survey-result/{self.scheduled.id}/")
+
+    def test_trend_changes_when_texts_are_analyzed(self):
+        models.Answer.objects.create(
+            survey=self.survey_result,
+            question=self.questions[3],
+            free_text_answer="Bra kollegor",
+            is_answered=True,
+        )
+        self.survey_result.submit()
+        url = (
+            f"/analysis/data/trend/?group_id={self.group.id}&surveys=all"
+            f"&question_id={self.questions[3].id}"
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.json()["text_themes"]["text_count"], 0)
+
+        models.TextAnalysis.process_pending()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["text_themes"]["text_count"], 1)
+
+
+class ScoreRollupTests(AnswerSurveyTestCase):
+    def setUp(self):
+        super().setUp()
+        other_user = models.CustomUser.objects.create_user(
+            "other@example.com", "Other", "pw"
+        )
+        other_user.employee_groups.add(self.group)
+        models.SurveyUserResult.objects.create(
+            published_survey=self.survey, user=other_user
+        ).employee_groups.add(self.group)
+
+        for user, slider_answer in ((self.user, 9), (other_user, 4)):
+            self.survey.survey_results.get(user=user).submit_answers(
+                [models.Answer(question=self.questions[0], slider_answer=slider_answer)]
+            )
+
+    def get_rollup(self, employee_group=None) -> models.ScoreRollup:
+        return models.ScoreRollup.objects.get(
+            organization=self.group.organization,
+            employee_group=employee_group,
+            lineage_id=self.questions[0].lineage_key,
+        )
+
+    def test_refresh_matches_the_answers(self):
+        self.assertEqual(models.ScoreRollup.refresh(batch_size=1), 2)
+        self.assertEqual(models.ScoreRollup.refresh(), 0)
+
+        for employee_group in (None, self.group):
+            rollup = self.get_rollup(employee_group)
+            self.assertEqual(rollup.answer_count, 2)
+            self.assertEqual(rollup.slider_sum, 13)
+            self.assertEqual(rollup.slider_sum_squares, 97)
+            self.assertEqual((rollup.promoters, rollup.detractors), (1, 1))
+            self.assertEqual(rollup.histogram[9] + rollup.histogram[4], 2)
+
+    def test_refresh_adds_to_a_row_inserted_by_another_refresh(self):
+        models.ScoreRollup.objects.create(
+            organization=self.group.organization,
+            lineage_id=self.questions[0].lineage_key,
+            month=timezone.localdate(self.survey.sending_date).replace(day=1),
+            histogram=[0] * 11,
+        )
+
+        models.ScoreRollup.refresh()
+
+        self.assertEqual(self.get_rollup().answer_count, 2)
+
+    def test_analysis_page_shows_the_monthly_mean_of_the_organization(self):
+        self.creator.survey_groups.add(self.group)
+        self.client.force_login(self.creator)
+        url = (
+            f"/analysis/?group_id={self.group.id}&surveys=all"
+            f"&question_id={self.questions[0].id}"
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.context["rollup_organization_means"], [])
+
+        models.ScoreRollup.refresh()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["rollup_organization_means"], [6.5])
+        self.assertContains(response, 'id="organizationRollupTrend"')
+
+
+class SummaryCacheTests(AnswerSurveyTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        # Another process is computing the summary, and an older version is cached
+        self.question = self.questions[0]
+        key_prefix = f"question-summary:{self.question.id}:{self.survey.id}:None:None"
+        self.survey.refresh_from_db()
+        cache.set(f"{key_prefix}:v{self.survey.collected_answer_count}:lock", True)
+        cache.set(f"{key_prefix}:latest", {"stale": True})
+
+    @override_settings(SUMMARY_CACHE_LOCKS=True)
+    def test_shared_cache_serves_the_previous_version_while_locked(self):
+        summary = AnalysisHandler().get_cached_question_summary(
+            self.question, self.survey
+        )
+
+        self.assertTrue(summary["stale"])
+
+    @override_settings(SUMMARY_CACHE_LOCKS=False)
+    def test_per_process_cache_computes_the_summary(self):
+        summary = AnalysisHandler().get_cached_question_summary(
+            self.question, self.survey
+        )
+
+        self.assertNotIn("stale", summary)
+        self.assertEqual(summary["question"], self.question)
+
+
+class InvalidIdTests(AnswerSurveyTestCase):
+    def setUp(self):
+        super().setUp()
+        self.creator.survey_groups.add(self.group)
+        self.client.force_login(self.creator)
+
+    def test_search_with_invalid_group_id_is_not_found(self):
+        response = self.client.get("/analysis/search/?q=bra&group_id=abc")
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_analysis_data_with_invalid_group_id_is_not_found(self):
+        response = self.client.get("/analysis/data/participation/?group_id=abc")
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_analysis_data_only_shows_questions_of_the_group(self):
+        url = f"/analysis/data/trend/?group_id={self.group.id}&question_id="
+        other_question = models.Question.objects.create(
+            question="Annan fråga", question_format=models.QuestionFormat.SLIDER
+        )
+
+        self.assertEqual(
+            self.client.get(url + str(self.questions[0].id)).status_code, 200
+        )
+        self.assertEqual(self.client.get(url + str(other_question.id)).status_code, 404)
+        self.assertEqual(self.client.get(url + "abc").status_code, 404)
+
+
+class TextThemesTests(AnswerSurveyTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.text_question = self.questions[3]
+        self.text_question.bank_question_tag = self.text_question.id
+        self.text_question.save()
+        models.Answer.objects.create(
+            survey=self.survey_result,
+            question=self.text_question,
+            free_text_answer="Bra kollegor",
+            is_answered=True,
+        )
+        self.survey_result.submit()
+        models.TextAnalysis.process_pending()
+
+        self.creator.survey_groups.add(self.group)
+        self.client.force_login(self.creator)
+
+    def test_free_text_question_can_be_selected(self):
+        response = self.client.get(f"/analysis/?group_id={self.group.id}&surveys=all")
+
+        self.assertIn(self.text_question, response.context["bank_questions"])
+
+    def test_themes_of_a_free_text_question_are_shown(self):
+        response = self.client.get(
+            f"/analysis/?group_id={self.group.id}&surveys=all"
+            f"&question_id={self.text_question.id}"
+        )
+
+        self.assertEqual(response.context["selected_question_format"], "text")
+        self.assertEqual(response.context["text_themes"]["text_count"], 1)
+        self.assertContains(response, "kollegor (1)")
+
+
+class AggregationTests(AnswerSurveyTestCase):
+    """
+    The precomputed answer statistics compared with the same statistics
+    computed from the answers themselves.
+    """
+
+    SLIDER_ANSWERS = [9, 4, 7.5, 10]
+    MULTIPLE_CHOICE_ANSWERS = [
+        [True, False, True],
+        [False, True, False],
+        [True, False, False],
+        [True, True, True],
+    ]
+    YES_NO_ANSWERS = [True, False, True, True]
+
+    def setUp(self):
+        super().setUp()
+        self.user_count = 0
+        self.results = [self.survey_result]
+        self.results += [self.add_result(self.survey) for _ in self.SLIDER_ANSWERS[1:]]
+        for result, slider, selected, yes_no in zip(
+            self.results,
+            self.SLIDER_ANSWERS,
+            self.MULTIPLE_CHOICE_ANSWERS,
+            self.YES_NO_ANSWERS,
+        ):
+            result.submit_answers(
+                [
+                    models.Answer(question=self.questions[0], slider_answer=slider),
+                    models.Answer(
+                        question=self.questions[1], multiple_choice_answer=selected
+                    ),
+                    models.Answer(question=self.questions[2], yes_no_answer=yes_no),
+                    models.Answer(
+                        question=self.questions[3],
+                        free_text_answer="Bra kollegor",
+                        comment="Kommentar",
+                    ),
+                ]
+            )
+
+    def add_result(self, survey: models.Survey) -> models.SurveyUserResult:
+        """
+        A new employee of the group, with an unanswered result of the survey.
+        """
+        self.user_count += 1
+        user = models.CustomUser.objects.create_user(
+            f"employee{self.user_count}@example.com", "Employee", "pw"
+        )
+        user.employee_groups.add(self.group)
+        result = models.SurveyUserResult.objects.create(
+            published_survey=survey, user=user
+        )
+        result.employee_groups.add(self.group)
+        return result
+
+    def raw_aggregate(self, question: models.Question, **filters) -> dict:
+        """
+        The answer values of a question, counted from its submitted answers.
+        """
+        answers = models.Answer.objects.filter(
+            question=question, survey__is_answered=True, **filters
+        )
+        options = question.multiple_choice_question
+        aggregate = {
+            "count": answers.count(),
+            "slider": Counter(),
+            "yes_no": Counter(),
+            "multiple_choice": [0] * (len(options.options) if options else 0),
+        }
+        for answer in answers:
+            if answer.slider_answer is not None:
+                aggregate["slider"][answer.slider_answer] += 1
+            if answer.yes_no_answer is not None:
+                aggregate["yes_no"][answer.yes_no_answer] += 1
+            for idx, selected in enumerate(answer.multiple_choice_answer or []):
+                aggregate["multiple_choice"][idx] += selected
+        return aggregate
+
+    def assertAggregatesMatch(self, aggregates: dict, **filters):
+        for question in self.questions:
+            expected = self.raw_aggregate(question, **filters)
+            aggregate = aggregates[question.id]
+            # Counts of options that were never selected may be left out
+            multiple_choice = list(aggregate["multiple_choice"])
+            multiple_choice += [0] * (
+                len(expected["multiple_choice"]) - len(multiple_choice)
+            )
+            self.assertEqual(
+                {
+                    "count": aggregate["count"],
+                    "slider": aggregate["slider"],
+                    "yes_no": aggregate["yes_no"],
+                    "multiple_choice": multiple_choice,
+                },
+                expected,
+                question.question,
+            )
+
+    def test_question_stats_match_the_answers(self):
+        handler = AnalysisHandler()
+        self.assertAggregatesMatch(
+            handler.get_answer_aggregates(self.questions, self.survey)
+        )
+        self.assertAggregatesMatch(
+            handler.get_answer_aggregates(
+                self.questions, self.survey, employee_group=self.group
+            ),
+            survey__employee_groups=self.group,
+        )
+
+        stats = models.QuestionStats.objects.get(
+            question=self.questions[0], employee_group__isnull=True
+        )
+        self.assertAlmostEqual(stats.mean, statistics.fmean(self.SLIDER_ANSWERS))
+        self.assertEqual(
+            stats.standard_deviation,
+            round(statistics.pstdev(self.SLIDER_ANSWERS), 2),
+        )
+        self.assertEqual(stats.median, statistics.median(self.SLIDER_ANSWERS))
+
+    def test_survey_report_matches_the_answers(self):
+        AnalysisHandler().build_survey_report(self.survey)
+        # Only the report is left to read the statistics from
+        models.QuestionStats.objects.all().delete()
+
+        handler = AnalysisHandler()
+        self.assertAggregatesMatch(
+            handler.get_answer_aggregates(self.questions, self.survey)
+        )
+        self.assertAggregatesMatch(
+            handler.get_answer_aggregates(
+                self.questions, self.survey, employee_group=self.group
+            ),
+            survey__employee_groups=self.group,
+        )
+
+    def test_score_rollup_matches_the_answers(self):
+        models.ScoreRollup.refresh(batch_size=3)
+
+        values = self.SLIDER_ANSWERS
+        for employee_group in (None, self.group):
+            rollup = models.ScoreRollup.objects.get(
+                organization=self.group.organization,
+                employee_group=employee_group,
+                lineage_id=self.questions[0].lineage_key,
+            )
+            self.assertEqual(rollup.answer_count, len(values))
+            self.assertAlmostEqual(rollup.mean, statistics.fmean(values))
+            self.assertAlmostEqual(
+                rollup.standard_deviation, statistics.pstdev(values), places=2
+            )
+            self.assertEqual(
+                rollup.histogram,
+                [
+                    sum(math.floor(value + 0.5) == bucket for value in values)
+                    for bucket in range(11)
+                ],
+            )
+            self.assertEqual(
+                (rollup.promoters, rollup.passives, rollup.detractors),
+                (
+                    sum(value >= 9 for value in values),
+                    sum(7 <= value < 9 for value in values),
+                    sum(value < 7 for value in values),
+                ),
+            )
+
+    def test_lineage_trend_matches_the_answers(self):
+        template_question = models.Question.objects.create(
+            question="Hur mår du?", question_format=models.QuestionFormat.SLIDER
+        )
+        surveys = []
+        survey_answers = {}
+        for days_ago, values in ((14, [3, 5]), (0, [8, 9, 10])):
+            survey = models.Survey.objects.create(
+                name="Puls",
+                creator=self.creator,
+                deadline=timezone.now() + timedelta(days=7),
+                sending_date=timezone.now() - timedelta(days=days_ago),
+                last_notification=timezone.now(),
+            )
+            survey.employee_groups.add(self.group)
+            question = template_question.clone_for_survey(survey)
+            for value in values:
+                self.add_result(survey).submit_answers(
+                    [models.Answer(question=question, slider_answer=value)]
+                )
+            surveys.append(survey)
+            survey_answers[survey.id] = models.Answer.objects.filter(
+                question=question
+            ).values_list("slider_answer", flat=True)
+
+        # Copies keep their lineage when the wording is edited
+        question.question = "Hur mår du just nu?"
+        question.save()
+
+        trend = AnalysisHandler().get_question_trend(
+            question, surveys, employee_group=self.group
+        )
+        self.assertEqual(trend["survey_ids_trend"], [surveys[1].id, surveys[0].id])
+        self.assertEqual(
+            trend["slider_mean_trend"],
+            [
+                round(statistics.fmean(survey_answers[survey_id]), 2)
+                for survey_id in trend["survey_ids_trend"]
+            ],
+        )
+
+    def test_multiple_choice_mask_backfill_matches_the_answers(self):
+        backfill = import_module(
+            "medarbetarapp.migrations.0035_answer_multiple_choice_mask"
+        ).backfill_multiple_choice_mask
+        models.Answer.objects.update(multiple_choice_mask=None)
+
+        backfill(apps, None)
+
+        # Answers of a single user are grouped on the mask
+        handler = AnalysisHandler()
+        for result in self.results:
+            self.assertAggregatesMatch(
+                handler.get_answer_aggregates(
+                    self.questions, self.survey, user=result.user
+                ),
+                survey=result,
+            )
+
+
+class RemoveDuplicateAnswersMigrationTests(TransactionTestCase):
+    def setUp(self):
+        self.executor = MigrationExecutor(connection)
+        self.addCleanup(self.migrate_to_latest)
+
+    def migrate_to_latest(self):
+        self.executor.loader.build_graph()
+        self.executor.migrate(self.executor.loader.graph.leaf_nodes())
+
+    def test_the_latest_answered_duplicate_is_kept(self):
+        user = models.CustomUser.objects.create_user(
+            "employee@example.com", "Employee", "pw"
+        )
+        survey = models.Survey.objects.create(
+            name="Puls",
+            creator=user,
+            deadline=timezone.now() + timedelta(days=7),
+            sending_date=timezone.now(),
+            last_notification=timezone.now(),
+        )
+        question = models.Question.objects.create(
+            question="Hur mår du?", question_format=models.QuestionFormat.SLIDER
+        )
+        result = models.SurveyUserResult.objects.create(
+            published_survey=survey, user=user
+        )
+        self.executor.migrate([("medarbetarapp", "0041_survey_last_answered_at")])
+
+        # Answering question by question could save the same question more than once
+        models.Answer.objects.create(
+            survey=result, question=question, slider_answer=2, is_answered=True
+        )
+        kept = models.Answer.objects.create(
+            survey=result, question=question, slider_answer=9, is_answered=True
+        )
+        models.Answer.objects.create(survey=result, question=question)
+
+        self.migrate_to_latest()
+
+        self.assertEqual(
+            list(models.Answer.objects.values_list("id", "slider_answer")),
+            [(kept.id, 9)],
+        )
@@ -0,0 +1,170 @@
+"""
+Text analysis for free text answers and comments.
+
+Swedish text is tokenized into lower case words without stopwords, from
+which keywords, bigrams and a lexicon based sentiment score are computed.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-zåäöéü]+(?:-[a-zåäöéü]+)*")
+CLAUSE_PATTERN = re.compile(r"[.,;:!?\n]+")
+
+STOPWORDS = frozenset("""
+    alla allt att av blev bli blir blivit de dem den denna deras dess dessa det detta
+    dig din dina ditt du där då efter ej eller en er era ert ett från för ha hade han
+    hans har henne hennes hon honom hur här i icke ingen inom inte jag ju kan kunde man
+    med mellan men mig min mina mitt mot mycket ni nu när någon något några och om oss
+    på samma sedan sig sin sina sitta själv skulle som så sådan sådana sådant till
+    under upp ut utan vad var vara varför varit varje vars vart vem vi vid vilka vilkas
+    vilken vilket vår våra vårt än är åt över också bara lite mer mest får fick få
+    väldigt ganska ibland alltid känns känner tycker tror blir ska
+    """.split())
+
+# Words that flip the sentiment of the next sentiment word ("inte bra")
+NEGATIONS = frozenset({"inte", "ej", "aldrig", "ingen", "inget", "inga", "knappast"})
+
+SENTIMENT_LEXICON = {
+    # Positive
+    "bra": 1.0,
+    "bättre": 1.0,
+    "bäst": 1.0,
+    "roligt": 1.0,
+    "rolig": 1.0,
+    "kul": 1.0,
+    "trevlig": 1.0,
+    "trevligt": 1.0,
+    "trivs": 1.0,
+    "nöjd": 1.0,
+    "glad": 1.0,
+    "tydlig": 0.5,
+    "tydligt": 0.5,
+    "stöd": 0.5,
+    "stöttande": 1.0,
+    "uppskattad": 1.0,
+    "utveckling": 0.5,
+    "engagerad": 1.0,
+    "motiverad": 1.0,
+    "fantastisk": 1.0,
+    "fantastiskt": 1.0,
+    "flexibel": 0.5,
+    "flexibelt": 0.5,
+    "positiv": 1.0,
+    "positivt": 1.0,
+    "härlig": 1.0,
+    "härligt": 1.0,
+    "toppen": 1.0,
+    "tacksam": 1.0,
+    # Negative
+    "dålig": -1.0,
+    "dåligt": -1.0,
+    "sämre": -1.0,
+    "sämst": -1.0,
+    "stress": -1.0,
+    "stressigt": -1.0,
+    "stressad": -1.0,
+    "hög": -0.5,
+    "tung": -0.5,
+    "tungt": -0.5,
+    "svårt": -0.5,
+    "svår": -0.5,
+    "otydlig": -1.0,
+    "otydligt": -1.0,
+    "trött": -1.0,
+    "orolig": -1.0,
+    "oro": -1.0,
+    "missnöjd": -1.0,
+    "negativ": -1.0,
+    "negativt": -1.0,
+    "problem": -0.5,
+    "brist": -1.0,
+    "konflikt": -1.0,
+    "konflikter": -1.0,
+    "utbränd": -1.0,
+    "ensam": -1.0,
+    "frustrerande": -1.0,
+    "tråkigt": -1.0,
+    "arbetsbelastning": -0.5,
+}
+
+
+def tokenize(text: str | None) -> List[str]:
+    """
+    Split a text into lower case words, keeping Swedish letters and hyphenated words.
+    """
+    return TOKEN_PATTERN.findall((text or "").casefold())
+
+
+def keywords(tokens: List[str]) -> List[str]:
+    """
+    The tokens that carry meaning, i.e. without stopwords and very short words.
+    """
+    return [token for token in tokens if token not in STOPWORDS and len(token) > 2]
+
+
+def ngrams(tokens: List[str], n: int = 2) -> List[str]:
+    """
+    All n-grams (as space separated strings) of a list of tokens.
+    """
+    return [" ".join(tokens[i : i + n]) for i in range(len(tokens) - n + 1)]
+
+
+def sentiment(tokens: List[str]) -> float:
+    """
+    Lexicon based sentiment between -1 (negative) and 1 (positive), 0 if no
+    sentiment words are found. A negation flips the next sentiment word.
+    """
+    total = 0.0
+    matches = 0
+    negated = False
+    for token in tokens:
+        if token in NEGATIONS:
+            negated = True
+            continue
+        score = SENTIMENT_LEXICON.get(token)
+        if score is not None:
+            total += -score if negated else score
+            matches += 1
+            negated = False
+    if matches == 0:
+        return 0.0
+    return max(-1.0, min(1.0, total / matches))
+
+
+def analyze_text(text: str | None) -> Dict[str, Any]:
+    """
+    Analyze one text.
+
+    Returns:
+        Dict[str, Any]: A dictionary with keys:
+            - 'keywords': Keywords of the text, in order.
+            - 'bigrams': Pairs of keywords that follow each other directly within a clause.
+            - 'sentiment': Sentiment score between -1 and 1.
+    """
+    tokens = tokenize(text)
+    bigrams = []
+    for clause in CLAUSE_PATTERN.split((text or "").casefold()):
+        bigrams += [
+            bigram
+            for bigram in ngrams(tokenize(clause), 2)
+            if len(keywords(bigram.split())) == 2
+        ]
+    return {
+        "keywords": keywords(tokens),
+        "bigrams": bigrams,
+        "sentiment": round(sentiment(tokens), 3),
+    }
+
+
+def analyze_texts(texts: Iterable[Tuple[Any, str]]) -> Dict[Any, Dict[str, Any]]:
+    """
+    Analyze many texts.
+
+    Args:
+        texts (Iterable[Tuple[Any, str]]): Pairs of (key, text).
+
+    Returns:
+        Dict[Any, Dict[str, Any]]: Maps each key to the analysis of its text (see analyze_text).
+    """
+    return {key: analyze_text(text) for key, text in texts}
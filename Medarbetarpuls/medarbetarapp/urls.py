@@ -5,11 +5,20 @@ urlpatterns = [
     path("add-employee/", views.add_employee_view, name="add_employee"),
     path("edit-employee/", views.edit_employee_view, name="edit_employee"),
     path("analysis/", views.analysis_view, name="analysis"),
+    path("analysis/search/", views.search_answers_view, name="search_answers"),
+    path(
+        "analysis/data/<str:panel>/", views.analysis_data_view, name="analysis_data"
+    ),
     path(
         "survey/<int:survey_result_id>/question/<int:question_index>/",
         views.answer_survey_view,
         name="answer_survey",
     ),
+    path(
+        "survey/<int:survey_result_id>/all/",
+        views.answer_survey_all_view,
+        name="answer_survey_all",
+    ),
     path(
         "remove-employee-from-employee-group/",
         views.remove_employee_from_employee_group_view,
@@ -134,6 +143,11 @@ urlpatterns = [
     path(
         "survey-result/<int:survey_id>/", views.survey_result_view, name="survey_result"
     ),
+    path(
+        "survey-result/<int:survey_id>/question/<int:question_id>/",
+        views.survey_result_question_view,
+        name="survey_result_question",
+    ),
     path("survey-status/", views.survey_status_view, name="survey_status"),
     path(
         "unanswered-surveys/", views.unanswered_surveys_view, name="unanswered_surveys"
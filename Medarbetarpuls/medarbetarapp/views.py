@@ -1,22 +1,27 @@
 import random
+import hashlib
 import logging
 import platform
 from . import models
-from django.db.models import Q, Max, Count
+from django.db.models import Q, Max, Sum, Count, Prefetch
 from django.utils import timezone
 from django.urls import reverse
 from xmlrpc.client import Boolean
 from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from datetime import datetime, time
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from .models import QuestionType, SurveyUserResult, EmployeeGroup, QuestionFormat
 from django.core.mail import send_mail
-from .tasks import schedule_notification, publish_survey_async
+from .tasks import schedule_notification, publish_survey_async, freeze_survey_report
 from django.utils.timezone import make_aware
 from .analysis_handler import AnalysisHandler
+from .answer_search import search_answers
 from django.shortcuts import redirect, render
 from django.shortcuts import get_object_or_404
 from django.views.decorators.csrf import csrf_protect
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from .decorators import allowed_roles, logout_required
 from django.contrib.auth.decorators import login_required
 from django.db.models import Case, When, IntegerField, Value
@@ -280,6 +285,129 @@ def add_employee_view(request):
     )
 
 
+def _get_answerable_survey_result(
+    survey_result_id: int, user: models.CustomUser
+) -> models.SurveyUserResult:
+    """
+    Loads a survey result of the user together with its questions in a stable
+    order (with their format details) as published_survey.ordered_questions,
+    and the answers given so far.
+
+    Raises:
+        Http404: If the user has no such survey result
+    """
+    return get_object_or_404(
+        SurveyUserResult.objects.select_related("published_survey").prefetch_related(
+            Prefetch(
+                "published_survey__questions",
+                queryset=models.Question.objects.select_related(
+                    "slider_question",
+                    "multiple_choice_question",
+                    "yes_no_question",
+                    "text_question",
+                ).order_by("id"),
+                to_attr="ordered_questions",
+            ),
+            "answers",
+        ),
+        pk=survey_result_id,
+        user=user,
+    )
+
+
+def _multiple_choice_pairs(
+    question: models.Question, answer: models.Answer | None
+) -> zip | None:
+    """
+    Pairs each option of a multiple choice question with whether it is
+    selected in the answer, so a "double" loop can check the boxes.
+    """
+    if question.multiple_choice_question is None:
+        return None
+    options: list[str] = question.multiple_choice_question.options
+    selected: list[bool] = (answer and answer.multiple_choice_answer) or [
+        False for _ in options
+    ]
+    return zip(options, selected)
+
+
+def _parse_answer(
+    data, question: models.Question, suffix: str = ""
+) -> models.Answer | None:
+    """
+    Reads and validates the answer of a question from a submitted form.
+
+    Args:
+        data (QueryDict): The posted form
+        question (models.Question): The answered question
+        suffix (str): The suffix of the field names of the question, if any
+
+    Returns:
+        models.Answer | None: An unsaved answer, or None if the answer
+        is missing or invalid
+    """
+    answer = models.Answer(
+        question=question, comment=data.get(f"comment{suffix}") or None
+    )
+    if answer.comment is not None and len(answer.comment) > 255:
+        return None
+
+    if question.question_format == models.QuestionFormat.SLIDER:
+        try:
+            answer.slider_answer = float(data.get(f"slider{suffix}", ""))
+        except ValueError:
+            return None
+        if not 0 <= answer.slider_answer <= 10:
+            return None
+    elif question.question_format == models.QuestionFormat.TEXT:
+        answer.free_text_answer = data.get(f"text{suffix}", "").strip()
+        if not answer.free_text_answer or len(answer.free_text_answer) > 255:
+            return None
+    elif question.question_format == models.QuestionFormat.YES_NO:
+        yes_no: str | None = data.get(f"yesno{suffix}")
+        if yes_no not in ("True", "False"):
+            return None
+        answer.yes_no_answer = yes_no == "True"
+    elif question.question_format == models.QuestionFormat.MULTIPLE_CHOICE:
+        selected: list[str] = data.getlist(f"multiplechoice{suffix}")
+        all_options: list[str] = question.multiple_choice_question.options
+        if not set(selected) <= set(all_options):
+            return None
+        answer.multiple_choice_answer = [opt in selected for opt in all_options]
+    else:
+        return None
+
+    answer.is_answered = True
+    return answer
+
+
+def _parse_survey_answers(
+    data, questions: list[models.Question]
+) -> list[models.Answer] | None:
+    """
+    Reads the answers of all questions from a submitted one page survey form,
+    where the fields of each question are suffixed with the question id
+    (e.g. "slider-12" and "comment-12").
+
+    Args:
+        data (QueryDict): The posted form
+        questions (list[models.Question]): The questions of the survey
+
+    Returns:
+        list[models.Answer] | None: One unsaved answer per question,
+        or None if an answer is missing or invalid
+    """
+    answers: list[models.Answer] = []
+    for question in questions:
+        answer: models.Answer | None = _parse_answer(
+            data, question, suffix=f"-{question.id}"
+        )
+        if answer is None:
+            return None
+        answers.append(answer)
+    return answers
+
+
 @login_required
 @csrf_protect
 @allowed_roles("surveycreator", "surveyresponder")
@@ -289,7 +417,9 @@ def answer_survey_view(
     """
     Makes it possible for the user to answer all questions of a survey.
     Page is navigated using its question index which is then used to
-    save and display a unique Answer object for each Question.
+    save and display a unique Answer object for each Question. Answers
+    are kept as drafts in the cache while navigating, and written to
+    the database when the survey is submitted or left.
 
     Args:
         request: The input from the various answer fields
@@ -301,16 +431,20 @@ def answer_survey_view(
         page after survey completion, otherwise status 400 on errors
     """
     user: models.CustomUser = request.user
-    survey_result: models.SurveyUserResult = get_object_or_404(
-        SurveyUserResult, pk=survey_result_id, user=user
-    )
-    questions: list[models.Question] = survey_result.published_survey.questions.all()
-    answers: list[models.Answer] = survey_result.answers.all()
-    answer: models.Answer = models.Answer()
-    survey_result = get_object_or_404(
-        SurveyUserResult, pk=survey_result_id, user=request.user
+    survey_result: models.SurveyUserResult = _get_answerable_survey_result(
+        survey_result_id, user
     )
-    questions = survey_result.published_survey.questions.all()
+    questions: list[models.Question] = survey_result.published_survey.ordered_questions
+    if not 0 <= question_index < len(questions):
+        raise Http404("Question not found")
+
+    # Answers are found by their question, not by their position in the list.
+    # Answers given since the survey was opened are drafts in the cache.
+    drafts: dict[int, models.Answer] = survey_result.get_drafts(questions)
+    answers: dict[int, models.Answer] = {
+        answer.question_id: answer for answer in survey_result.answers.all()
+    }
+    answers.update(drafts)
 
     # Calculate question navigation indexes
     if question_index - 1 < 0:
@@ -325,27 +459,23 @@ def answer_survey_view(
 
     question: models.Question = questions[question_index]
 
-    # Create a new answer if none exists for this question
-    if question_index >= len(answers):
+    # Get the existing answer, or a new one that is only kept when posted
+    answer: models.Answer | None = answers.get(question.id)
+    if answer is None:
         question_format: models.QuestionFormat = question.question_format
-        if question_format is not None:
-            if question_format == models.QuestionFormat.SLIDER:
-                answer = models.Answer(
-                    survey=survey_result, question=question, slider_answer=5.0
-                )
-            elif question_format == models.QuestionFormat.TEXT:
-                answer = models.Answer(survey=survey_result, question=question)
-            elif question_format == models.QuestionFormat.YES_NO:
-                answer = models.Answer(survey=survey_result, question=question)
-            elif question_format == models.QuestionFormat.MULTIPLE_CHOICE:
-                answer = models.Answer(survey=survey_result, question=question)
-            else:
-                return HttpResponse(status=400)
-
-            answer.save()
-    # Otherwise get the existing question
-    else:
-        answer = answers[question_index]
+        if question_format == models.QuestionFormat.SLIDER:
+            answer = models.Answer(
+                survey=survey_result, question=question, slider_answer=5.0
+            )
+        elif question_format in (
+            None,
+            models.QuestionFormat.TEXT,
+            models.QuestionFormat.YES_NO,
+            models.QuestionFormat.MULTIPLE_CHOICE,
+        ):
+            answer = models.Answer(survey=survey_result, question=question)
+        else:
+            return HttpResponse(status=400)
 
     if request.method == "POST":
         if request.headers.get("HX-Request"):
@@ -355,33 +485,29 @@ def answer_survey_view(
 
             # Save the format specific answer
             if question_format is not None:
-                if question_format == "slider":
-                    answer.slider_answer = request.POST.get("slider")
-                elif question_format == "text":
-                    answer.free_text_answer = request.POST.get("text")
-                elif question_format == "yesno":
-                    answer.yes_no_answer = request.POST.get("yesno")
-                elif question_format == "multiplechoice":
-                    selected: list[str] = request.POST.getlist("multiplechoice")
-                    all_options: list[str] = question.multiple_choice_question.options
-                    bool_list: list[bool] = [opt in selected for opt in all_options]
-                    answer.multiple_choice_answer = bool_list
-
-                # Also save the potential comment
-                answer.comment = request.POST.get("comment")
-                answer.is_answered = True
-                answer.save()
+                answer = _parse_answer(request.POST, question)
+                if answer is None:
+                    return HttpResponse(status=400)
+                answer.survey = survey_result
 
                 # All questions answered, submit answers and redirect
                 if submit_answers == "submit":
-                    survey_result.is_answered = True
-                    survey_result.published_survey.collected_answer_count += 1
-                    survey_result.published_survey.save()
-                    survey_result.save()
+                    # Saves the drafts, marks the result as answered and
+                    # updates the question statistics in one transaction
+                    drafts[question.id] = answer
+                    if not survey_result.submit_answers(list(drafts.values())):
+                        # The survey has already been submitted
+                        return HttpResponse(status=400)
 
                     # Redirect to unanswered surveys page after completion
                     return HttpResponse(headers={"HX-Redirect": "/unanswered-surveys/"})
 
+                # Keep the answer in the cache until the survey is submitted or left
+                try:
+                    survey_result.save_draft(answer)
+                except ValidationError:
+                    return HttpResponse(status=400)
+
                 if action == "previous":
                     # Redirect to previous question
                     return HttpResponse(
@@ -403,40 +529,19 @@ def answer_survey_view(
                         }
                     )
                 elif action == "exit":
-                    # Redirect back to all unanswered surveys
+                    # Save the drafts and redirect back to all unanswered surveys
+                    survey_result.flush_drafts(questions)
                     return HttpResponse(headers={"HX-Redirect": "/unanswered-surveys/"})
 
             return HttpResponse(status=400)
 
-    # This is added so a "double" loop can be used to go through
-    # which boxes should be checked
-    if question.multiple_choice_question is not None:
-        # Edge case where no answer yet exists, but we still
-        # want to display the options...
-        if not answer.multiple_choice_answer:
-            zipped = zip(
-                question.multiple_choice_question.options,
-                [False for _ in question.multiple_choice_question.options],
-            )
-        else:
-            zipped = zip(
-                question.multiple_choice_question.options, answer.multiple_choice_answer
-            )
-    else:
-        zipped = None
+    zipped = _multiple_choice_pairs(question, answer)
 
-    # Calculate amount of "answered" answers
-    # Start at 1 because the last question always gets a saved answer
-    # that is not counted
-    total_answers: int = 1
-    for ans in answers:
-        if ans.is_answered:
-            total_answers += 1
-
-    # Sometimes the extra one added at the begining will cause this to
-    # be bigger than amount of questions, do not wory about it :)
-    if total_answers > len(questions):
-        total_answers = len(questions)
+    # Calculate amount of "answered" answers, the shown question is
+    # saved as well when the survey is submitted from it
+    total_answers: int = sum(ans.is_answered for ans in answers.values())
+    if not answer.is_answered:
+        total_answers += 1
 
     return render(
         request,
@@ -458,6 +563,72 @@ def answer_survey_view(
     )
 
 
+@login_required
+@csrf_protect
+@allowed_roles("surveycreator", "surveyresponder")
+def answer_survey_all_view(request, survey_result_id: int) -> HttpResponse:
+    """
+    Shows all questions of a survey on one page, for users who prefer that
+    to answering question by question. The answers stay in the browser until
+    the whole survey is submitted with one POST, which saves all answers and
+    marks the survey as answered together.
+
+    Args:
+        request: The answers of all questions on POST
+        survey_result_id (int): The id of the SurveyResult being answered
+
+    Returns:
+        HttpResponse: The page on GET, redirects to the unanswered surveys page
+        after submission, otherwise status 400 on invalid answers
+    """
+    user: models.CustomUser = request.user
+    survey_result: models.SurveyUserResult = _get_answerable_survey_result(
+        survey_result_id, user
+    )
+    questions: list[models.Question] = survey_result.published_survey.ordered_questions
+
+    if request.method == "POST":
+        if survey_result.is_answered:
+            return HttpResponse(status=400)
+
+        answers = _parse_survey_answers(request.POST, questions)
+        if answers is None or not survey_result.submit_answers(answers):
+            return HttpResponse(status=400)
+
+        return HttpResponse(headers={"HX-Redirect": "/unanswered-surveys/"})
+
+    # Show the answers already given question by question
+    answers: dict[int, models.Answer] = {
+        answer.question_id: answer for answer in survey_result.answers.all()
+    }
+    answers.update(survey_result.get_drafts(questions))
+    items: list[dict] = []
+    for question in questions:
+        answer = answers.get(question.id)
+        items.append(
+            {
+                "question": question,
+                "answer": answer,
+                "slider_answer": (
+                    answer.slider_answer
+                    if answer and answer.slider_answer is not None
+                    else 5.0
+                ),
+                "multiple_choice_pairs": _multiple_choice_pairs(question, answer),
+            }
+        )
+
+    return render(
+        request,
+        "answer_survey_all.html",
+        {
+            "survey_result": survey_result,
+            "items": items,
+            "total": len(questions),
+        },
+    )
+
+
 @csrf_protect
 def resend_authentication_code_acc(request):
     """
@@ -1456,6 +1627,7 @@ def publish_survey(request, survey_id: int) -> HttpResponse:
                     args=[survey.id], eta=survey.sending_date
                 )
                 schedule_notification(survey.id, reminders)
+                freeze_survey_report.apply_async(args=[survey.id], eta=survey.deadline)
             else:
                 survey.publish_survey()
 
@@ -2163,17 +2335,73 @@ def start_admin_view(request):
     )
 
 
+def _survey_result_state(request, survey_id: int) -> dict | None:
+    """
+    What the survey result page depends on: the survey's participant and answer
+    counts, when it last changed and whether the viewer has submitted. Two small
+    queries, kept on the request for both the ETag and the Last-Modified check.
+    """
+    if not hasattr(request, "_survey_result_state"):
+        state = (
+            models.Survey.objects.filter(id=survey_id)
+            .values(
+                "published_count",
+                "collected_answer_count",
+                "last_answered_at",
+                "sending_date",
+            )
+            .first()
+        )
+        if state is not None:
+            state["has_result"] = SurveyUserResult.objects.filter(
+                published_survey_id=survey_id, user=request.user, is_answered=True
+            ).exists()
+        request._survey_result_state = state
+    return request._survey_result_state
+
+
+def _survey_result_etag(request, survey_id: int) -> str | None:
+    state = _survey_result_state(request, survey_id)
+    if state is None:
+        return None
+    # The session key changes on every login, and with it the csrf token in the page
+    key = [
+        survey_id,
+        state["published_count"],
+        state["collected_answer_count"],
+        state["has_result"],
+        request.user.id,
+        request.session.session_key,
+    ]
+    return hashlib.sha1(repr(key).encode()).hexdigest()
+
+
+def _survey_result_last_modified(request, survey_id: int) -> datetime | None:
+    state = _survey_result_state(request, survey_id)
+    if state is None:
+        return None
+    return state["last_answered_at"] or state["sending_date"]
+
+
 @login_required
 @allowed_roles("surveycreator", "surveyresponder")
+@cache_control(private=True, no_cache=True)
+@condition(
+    etag_func=_survey_result_etag, last_modified_func=_survey_result_last_modified
+)
 def survey_result_view(request, survey_id):
     """
-    Shows the result from a survey
+    Shows the result from a survey. The page itself only lists the questions,
+    the result of every question is loaded by htmx when it is scrolled into
+    view (see survey_result_question_view). The results only change when a
+    result is submitted, so the page has an ETag and Last-Modified and a
+    browser that already has the current page gets a 304.
 
     Args:
         request: The survey_id for the survey
 
     Returns:
-        HttpResponse: Renders survey_result if all is good, otherwise 400
+        HttpResponse: Renders survey_result if all is good, 304 if unchanged, otherwise 400
     """
     survey = models.Survey.objects.filter(id=survey_id).first()
 
@@ -2181,40 +2409,92 @@ def survey_result_view(request, survey_id):
         # This survey has no answers (should not even be displayed to the user then)
         return HttpResponse(400)
 
-    analysis_handler = AnalysisHandler()
+    # Same questions and order as AnalysisHandler.get_survey_summary
+    questions = survey.questions.order_by("id")
 
-    # Retrievs all survey results of this survey
-    survey_results = survey.survey_results.all()
-    user = request.user
+    return render(
+        request,
+        "survey_result.html",
+        {"survey": survey, "questions": questions},
+    )
 
-    # Check if user has answered this survey
-    has_result: bool = survey_results.filter(user=user, is_answered=True).exists()
 
-    # Check if user is the creator
-    is_creator: bool = survey.creator == user
+def _survey_result_question_etag(request, survey_id: int, question_id: int) -> str | None:
+    state = _survey_result_state(request, survey_id)
+    if state is None:
+        return None
+    key = [
+        survey_id,
+        question_id,
+        request.GET.get("number"),
+        state["published_count"],
+        state["collected_answer_count"],
+        state["has_result"],
+        request.user.id,
+    ]
+    return hashlib.sha1(repr(key).encode()).hexdigest()
 
-    summary_context = analysis_handler.get_survey_summary(survey.id)
-    for summary in summary_context["summaries"]:
-        summary["my_result"] = analysis_handler.get_answers(
-            summary["question"], user=user, survey=survey
-        ).first()
 
-        if "text_answers" in summary and summary["text_answers"]:
-            answers = list(summary["text_answers"])
-            random.shuffle(answers)
-            summary["text_answers"] = answers
+def _survey_result_question_last_modified(
+    request, survey_id: int, question_id: int
+) -> datetime | None:
+    return _survey_result_last_modified(request, survey_id)
 
-    # Add context to summary_context
-    summary_context["has_result"] = has_result
-    summary_context["is_creator"] = is_creator
 
-    if survey_results is None:
-        # This survey has no answers (should not even be displayed to the user then)
-        return HttpResponse(400)
+@login_required
+@allowed_roles("surveycreator", "surveyresponder")
+@cache_control(private=True, no_cache=True)
+@condition(
+    etag_func=_survey_result_question_etag,
+    last_modified_func=_survey_result_question_last_modified,
+)
+def survey_result_question_view(request, survey_id: int, question_id: int):
+    """
+    The result of one question of a survey, loaded into survey_result.html by
+    htmx. The summary is cached per question and survey version, and the
+    response can be revalidated like the page.
+
+    Args:
+        request: GET request, with the number of the question in the survey in number.
+        survey_id (int): The survey.
+        question_id (int): The question, must belong to the survey.
+
+    Returns:
+        HttpResponse: The question box (partials/survey-result-question.html), 304 if unchanged.
+    """
+    survey = get_object_or_404(models.Survey, id=survey_id)
+    question = get_object_or_404(
+        models.Question.objects.select_related("multiple_choice_question"),
+        id=question_id,
+        connected_surveys=survey,
+    )
+    user = request.user
+    analysis_handler = AnalysisHandler()
+
+    summary = analysis_handler.get_cached_question_summary(question, survey)
+    if summary is None:
+        # Unknown question format, nothing to show
+        return HttpResponse()
+
+    summary["my_result"] = analysis_handler.get_user_answers(survey, user).get(
+        question.id
+    )
 
-    # Proceed to render the survey results
-    print (summary_context)
-    return render(request, "survey_result.html", summary_context)
+    if "text_answers" in summary and summary["text_answers"]:
+        answers = list(summary["text_answers"])
+        random.shuffle(answers)
+        summary["text_answers"] = answers
+
+    return render(
+        request,
+        "partials/survey-result-question.html",
+        {
+            "summary": summary,
+            "number": request.GET.get("number", ""),
+            "has_result": _survey_result_state(request, survey_id)["has_result"],
+            "is_creator": survey.creator_id == user.id,
+        },
+    )
 
 
 @login_required
@@ -2308,8 +2588,102 @@ def correct_name(name: str) -> Boolean | str:
         return res
 
 
+def _limit_survey_range(surveys, survey_range: str):
+    """
+    The latest survey_range surveys of a queryset ordered latest first, or all of
+    them for "all" or an invalid range.
+    """
+    if survey_range != "all":
+        try:
+            return surveys[: int(survey_range)]
+        except ValueError:
+            pass
+    return surveys
+
+
+def _analysis_page_state(request) -> dict:
+    """
+    What the analysis page depends on besides its filters: the groups that can be
+    chosen, the participant and answer counts of the surveys in range and, when a
+    question is selected, the latest text analysis (the comment themes) and the
+    number of answers in the monthly statistics of the organization. Kept on the
+    request for both the ETag and the Last-Modified check.
+    """
+    if not hasattr(request, "_analysis_page_state"):
+        user = request.user
+        group_id = request.GET.get("group_id")
+        state = {
+            "group_ids": sorted(
+                user.survey_groups.filter(
+                    id__in=user.get_published_group_ids()
+                ).values_list("id", flat=True)
+            ),
+            "surveys": [],
+            "text_analysis_id": None,
+            "rollup_answer_count": None,
+        }
+        if group_id and group_id.isdigit():
+            surveys = _limit_survey_range(
+                models.Survey.objects.filter(employee_groups=group_id)
+                .order_by("-sending_date")
+                .distinct(),
+                request.GET.get("surveys", "1"),
+            )
+            state["surveys"] = list(
+                surveys.values_list(
+                    "id",
+                    "published_count",
+                    "collected_answer_count",
+                    "last_answered_at",
+                    "sending_date",
+                )
+            )
+            if request.GET.get("question_id"):
+                state["text_analysis_id"] = models.TextAnalysis.objects.aggregate(
+                    latest=Max("id")
+                )["latest"]
+                # The monthly statistics of the organization grow with every refresh
+                state["rollup_answer_count"] = models.ScoreRollup.objects.filter(
+                    organization__employee_groups=group_id,
+                    employee_group__isnull=True,
+                ).aggregate(total=Sum("answer_count"))["total"]
+        request._analysis_page_state = state
+    return request._analysis_page_state
+
+
+def _analysis_page_etag(request) -> str:
+    state = _analysis_page_state(request)
+    key = [
+        ANALYSIS_DATA_VERSION,
+        request.user.id,
+        request.session.session_key,
+        sorted(request.GET.items()),
+        state["group_ids"],
+        [survey[:3] for survey in state["surveys"]],
+        state["text_analysis_id"],
+        state["rollup_answer_count"],
+    ]
+    return hashlib.sha1(repr(key).encode()).hexdigest()
+
+
+def _analysis_page_last_modified(request) -> datetime | None:
+    return max(
+        (
+            last_answered_at or sending_date
+            for *_, last_answered_at, sending_date in _analysis_page_state(request)[
+                "surveys"
+            ]
+        ),
+        default=None,
+    )
+
+
 @login_required
 @allowed_roles("admin", "surveycreator")
+@cache_control(private=True, no_cache=True)
+@condition(
+    etag_func=_analysis_page_etag, last_modified_func=_analysis_page_last_modified
+)
 def analysis_view(request):
     group_id = request.GET.get("group_id")
     survey_range = request.GET.get("surveys", "1")
@@ -2331,14 +2705,10 @@ def analysis_view(request):
         "selected_group_id": group_id,
     }
 
-    employee_groups_creator = user.survey_groups.all()
-    available_groups = []
-    for e_g in employee_groups_creator:
-        for survey in user.published_surveys.all():
-            if e_g in survey.employee_groups.all():
-                if e_g not in available_groups:
-                    available_groups.append(e_g)
-    context["available_groups"] = available_groups
+    # The user's survey groups that at least one survey has been published to
+    context["available_groups"] = user.survey_groups.filter(
+        id__in=user.get_published_group_ids()
+    ).order_by("id")
 
     if not group_id:
         return render(request, "analysis.html", context)
@@ -2352,15 +2722,8 @@ def analysis_view(request):
     # Order surveys (latest first)
     surveys = surveys.order_by("-sending_date")
 
-    if survey_range != "all":
-        # Get filtered surveys to the chosen amount
-        try:
-            count = int(survey_range)
-            filtered_surveys = surveys[:count]
-        except ValueError:
-            filtered_surveys = surveys
-    else:
-        filtered_surveys = surveys
+    # Get filtered surveys to the chosen amount
+    filtered_surveys = _limit_survey_range(surveys, survey_range)
 
     if not filtered_surveys:
         context["message"] = "Inga filtrerade enkäter hittades."
@@ -2373,9 +2736,6 @@ def analysis_view(request):
 
     # Get anonymous respondents for the most recent survey, used for the user filter
     latest_survey = filtered_surveys[0]
-    context["answerDistributionLabels"] = [
-        q.question for q in latest_survey.questions.all().order_by("id")
-    ]
 
     respondents_dict = analysisHandler.get_respondents(
         survey=latest_survey, employee_group=group
@@ -2388,6 +2748,9 @@ def analysis_view(request):
         employee_group=group,
     )
     context.update(survey_answer_dist)
+    context["answerDistributionLabels"] = [
+        q.question for q in survey_answer_dist["questions"]
+    ]
 
     selected_question_format = None
     if question_id:
@@ -2406,8 +2769,32 @@ def analysis_view(request):
             selected_question_format = trend_data["question_format_trend"][0]
             context.update(trend_data)
 
+        # Monthly statistics of the whole organization, from the background rollup
+        if (
+            selected_question_format in ("slider", "enps")
+            and group.organization is not None
+        ):
+            rollup = analysisHandler.get_organization_rollup(
+                group.organization, selected_question
+            )
+            context["rollup_months"] = rollup["months"]
+            context["rollup_organization_means"] = (
+                rollup["series"].get(group.organization.name, {}).get("mean", [])
+            )
+
+        # Themes of the comments, from the background text analysis
+        context["text_themes"] = analysisHandler.get_text_themes(
+            analysisHandler.get_question_lineage(
+                selected_question, filtered_surveys
+            ).values(),
+            employee_group=group,
+            user=respondents_dict.get(user_id) if user_id else None,
+        )
+
     context["selected_question_format"] = selected_question_format
-    filtered_bank_questions = analysisHandler.get_bank_questions(filtered_surveys)
+    filtered_bank_questions = analysisHandler.get_bank_questions(
+        filtered_surveys, employee_group=group
+    )
 
     context["bank_questions"] = filtered_bank_questions
     # pass these to frontend for typing
@@ -2415,3 +2802,201 @@ def analysis_view(request):
     context["QuestionType"] = QuestionType
 
     return render(request, "analysis.html", context)
+
+
+# Bump when the shape of the analysis data changes, so browsers drop cached responses
+ANALYSIS_DATA_VERSION = 1
+ANALYSIS_DATA_PANELS = ("participation", "distribution", "trend")
+
+
+def _analysis_data_filters(request) -> dict:
+    """
+    Resolves the analysis filters (group_id, surveys, user_id, question_id) of a
+    data request. The result is kept on the request, since both the ETag and the
+    view need it.
+
+    Args:
+        request: GET request with the same parameters as the analysis page.
+
+    Returns:
+        dict: The AnalysisHandler, the group, the filtered surveys (latest first),
+              the anonymous user label and the selected question (or None).
+
+    Raises:
+        Http404: For a group that is not one of the user's survey groups, or a
+                 question that is not in a survey sent to the group.
+    """
+    if not hasattr(request, "_analysis_data_filters"):
+        group_id = request.GET.get("group_id", "")
+        question_id = request.GET.get("question_id", "")
+        if not group_id.isdigit() or not (question_id == "" or question_id.isdigit()):
+            raise Http404("Okänd grupp eller fråga")
+
+        group = get_object_or_404(request.user.survey_groups, id=group_id)
+        analysisHandler = AnalysisHandler()
+        group_surveys = analysisHandler.get_surveys_for_group(group)
+        surveys = _limit_survey_range(group_surveys, request.GET.get("surveys", "1"))
+
+        request._analysis_data_filters = {
+            "handler": analysisHandler,
+            "group": group,
+            "surveys": list(surveys),
+            "user_id": request.GET.get("user_id") or None,
+            # Only the questions of surveys sent to the group
+            "question": (
+                get_object_or_404(
+                    models.Question.objects.filter(
+                        connected_surveys__in=group_surveys
+                    ).distinct(),
+                    id=question_id,
+                )
+                if question_id
+                else None
+            ),
+        }
+    return request._analysis_data_filters
+
+
+def _analysis_data_etag(request, panel: str) -> str:
+    """
+    The ETag of an analysis data response. The results of a survey change when
+    it is published (published_count, the participants) and when a result is
+    submitted (collected_answer_count), so these counts of the surveys in range
+    together with the filters identify the response. The trend panel also has
+    the comment themes, which change with every text analysis run.
+    """
+    if panel not in ANALYSIS_DATA_PANELS:
+        raise Http404("Okänd panel")
+
+    filters = _analysis_data_filters(request)
+    question = filters["question"]
+    key = [
+        ANALYSIS_DATA_VERSION,
+        panel,
+        filters["group"].id,
+        filters["user_id"],
+        question.id if question else None,
+        [
+            (survey.id, survey.published_count, survey.collected_answer_count)
+            for survey in filters["surveys"]
+        ],
+        (
+            models.TextAnalysis.objects.aggregate(latest=Max("id"))["latest"]
+            if panel == "trend"
+            else None
+        ),
+    ]
+    return hashlib.sha1(repr(key).encode()).hexdigest()
+
+
+def _json_ready(data: dict) -> dict:
+    """
+    Drops the model instances and querysets (questions, answers and comments) from
+    analysis results, the rest is plain lists and numbers.
+    """
+    return {
+        key: value
+        for key, value in data.items()
+        if key.removesuffix("_trend") not in ("question", "answers", "comments")
+    }
+
+
+@login_required
+@allowed_roles("admin", "surveycreator")
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_analysis_data_etag)
+def analysis_data_view(request, panel: str) -> JsonResponse:
+    """
+    The data of one chart panel of the analysis page as JSON, so charts.js can
+    reload the panel that changed instead of the whole page. Responses carry an
+    ETag and must be revalidated, so unchanged data is answered with 304.
+
+    Args:
+        request: GET request with the same filters as the analysis page
+                 (group_id, surveys, user_id and question_id).
+        panel (str): One of participation, distribution and trend (requires
+                     question_id), anything else is a 404.
+
+    Returns:
+        JsonResponse: The panel data, with the same keys as in the analysis page context.
+    """
+    filters = _analysis_data_filters(request)
+    analysisHandler = filters["handler"]
+    group = filters["group"]
+    surveys = filters["surveys"]
+    if not surveys:
+        return JsonResponse({})
+
+    user = None
+    if filters["user_id"]:
+        respondents = analysisHandler.get_respondents(
+            survey=surveys[0], employee_group=group
+        )
+        user = respondents.get(filters["user_id"])
+
+    if panel == "participation":
+        data = analysisHandler.get_participation_metrics(surveys, group)
+    elif panel == "distribution":
+        distribution = analysisHandler.get_survey_answer_distribution(
+            surveys[0], user=user, employee_group=group
+        )
+        data = _json_ready(distribution)
+        data["answerDistributionLabels"] = [
+            question.question for question in distribution["questions"]
+        ]
+        del data["questions"]
+    elif panel == "trend":
+        question = filters["question"]
+        if question is None:
+            return JsonResponse({"error": "question_id saknas"}, status=400)
+        data = _json_ready(
+            analysisHandler.get_question_trend(
+                question=question, surveys=surveys, employee_group=group, user=user
+            )
+        )
+        data["text_themes"] = analysisHandler.get_text_themes(
+            analysisHandler.get_question_lineage(question, surveys).values(),
+            employee_group=group,
+            user=user,
+        )
+
+    return JsonResponse(data)
+
+
+@login_required
+@allowed_roles("admin", "surveycreator")
+def search_answers_view(request):
+    """
+    Searches the free text answers and comments of all surveys sent to the
+    user's survey groups, or only one of them if group_id is given. Used by
+    the search field on the analysis page through HTMX.
+
+    Args:
+        request: GET request with the search words in q, optionally group_id
+                 and the cursor of the previous page in after.
+
+    Returns:
+        HttpResponse: The search results as a partial, with a button that loads the next page,
+        404 for an invalid group_id.
+    """
+    query = request.GET.get("q", "")
+    group_id = request.GET.get("group_id")
+
+    employee_groups = request.user.survey_groups.all()
+    if group_id:
+        if not group_id.isdigit():
+            raise Http404("Gruppen finns inte")
+        employee_groups = employee_groups.filter(id=group_id)
+
+    search = search_answers(query, employee_groups, after=request.GET.get("after"))
+    return render(
+        request,
+        "partials/answer-search-results.html",
+        {
+            "query": query,
+            "group_id": group_id or "",
+            "results": search["results"],
+            "next_cursor": search["next_cursor"],
+            "is_next_page": bool(request.GET.get("after")),
+        },
+    )